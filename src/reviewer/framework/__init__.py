@@ -1,5 +1,11 @@
-from .runtime  import *
-from .dataset  import *
-from .figure   import *
-from .workflow import *
-from .analysis import *
+from .cache      import *
+from .modelstore import *
+from .unique     import *
+from .sketch     import *
+from .ngram      import *
+from .buckets    import *
+from .runtime    import *
+from .dataset    import *
+from .figure     import *
+from .workflow   import *
+from .analysis   import *
@@ -1,6 +1,6 @@
 __all__ = ["MethodID", "WorkflowID", "AnalysisID",
            "Result", "ResultType", "ResultName", "NamedResults", "WorkFlowResults", "AnalysisResults",
-           "DatasetField", "AnalysisField", "AnalysisFieldMappings",
+           "DatasetField", "AnalysisField", "AnalysisFieldMappings", "Tokens",
            "AnalysisFields", "UsedResults",
            "MethodSchema", "WorkflowSchema", "AnalysisSchema",
            "AnalysisTracker", "WorkflowTracker"]
@@ -19,6 +19,11 @@ AnalysisID:      TypeAlias = str
 DatasetField:    TypeAlias = str
 AnalysisField:   TypeAlias = str
 
+class Tokens(list[str]):
+    """
+    Field type of tokenised text (one list of tokens per row)
+    """
+
 @dataclass 
 class FieldSchema:
     dtype:       Type[Any] | Any
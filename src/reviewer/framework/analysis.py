@@ -2,7 +2,7 @@ __all__ = ["AnalysisConfig", "Analysis"]
 
 from dataclasses import asdict, dataclass
 import pickle
-from typing import Any
+from typing import Any, Callable, Iterable, get_args
 
 from .interface import IConfig, IDataset, ILogger
 from .trait import get_object_id, Identifiable, Configurable
@@ -67,18 +67,142 @@ class Analysis(Identifiable, Configurable[AnalysisConfig]):
             data:    IDataset, 
             mapping: AnalysisFieldMappings,
             tracker: AnalysisTracker | None = None,
-            logger:  ILogger | None = None) -> tuple[IDataset, AnalysisResults]:
+            logger:  ILogger | None = None,
+            precomputed: AnalysisResults | None = None,
+            reused:  dict[WorkflowID, dict[str, dict[str, Any]]] | None = None) -> tuple[IDataset, AnalysisResults]:
 
         """Runs an analysis
 
+        If runtime.prune_fields is set, the dataset is projected onto the
+        used fields before the run, and fields are dropped as soon as no 
+        later step uses them.
+
         Args:
             data: dataset to be used for analysis
             mapping: a map of required fields onto dataset fields
+            precomputed: results of result-only steps, which are not run
+            reused: values of transforming steps, which are not run (see Workflow.transform)
+        Returns:
+            
+        """
+
+        data = self._prepare(runtime, data, mapping)
+
+        # Run analysis
+        results: AnalysisResults = {}
+        created_results: NamedResults = {}
+        for wid, workflow in enumerate(self._workflows):
+            if logger:
+                logger.log(f"Starting workflow '{workflow}'")
+
+            def w_tracker(sid: int, name: str) -> None:
+                if tracker:
+                    tracker(wid, sid, name)
+
+            # Fields used by later workflows are kept
+            def w_keep(field: str, later: list[Workflow] = self._workflows[wid + 1:]) -> bool:
+                return any([w.uses_field(field) for w in later])
+
+            data, method_results, created_results = workflow.run(runtime = runtime, 
+                                                                 data = data, 
+                                                                 created_named_results = created_results,
+                                                                 tracker = w_tracker,
+                                                                 logger  = logger,
+                                                                 keep    = w_keep if runtime.prune_fields else None,
+                                                                 precomputed = (precomputed or {}).get(workflow.id),
+                                                                 reused  = (reused or {}).get(workflow.id))
+
+            results[workflow.id] = method_results
+
+        return data, results
+
+    def run_stream(self, 
+                   runtime:  Runtime,
+                   sample:   IDataset, 
+                   chunks:   Iterable[IDataset],
+                   mapping:  AnalysisFieldMappings,
+                   on_chunk: Callable[[IDataset], None] | None = None,
+                   tracker:  AnalysisTracker | None = None,
+                   logger:   ILogger | None = None) -> AnalysisResults:
+
+        """Runs an analysis on a dataset streamed in chunks
+
+        The embedders and predictors are trained on the (in-memory) sample
+        first. Then the chunks are mapped and passed through the row-local
+        steps of all the workflows (see Workflow.transform), one at a time,
+        and handed to `on_chunk`. Partial analysers merge their states over
+        all the chunks, while the other results are computed on the sample
+        (reusing the outputs of its training pass).
+
+        Without `on_chunk`, only the steps the partial analysers depend on
+        are run on the chunks (and none are read, if there are no partial
+        analysers).
+
+        Args:
+            sample: sample of the dataset (partitioned into train and test data)
+            chunks: the whole dataset, in chunks
+            mapping: a map of required fields onto dataset fields
+            on_chunk: callback receiving the transformed chunks
         Returns:
             
         """
 
+        # Train on the sample (its transformed fields are reused below)
+        reused: dict[WorkflowID, dict[str, dict[str, Any]]] = {}
+
+        data = self._prepare(runtime, sample, mapping)
+        for workflow in self._workflows:
+            reused[workflow.id] = {}
+            data = workflow.transform(data, fit = True, runtime = runtime, outputs = reused[workflow.id])
+
+        # Steps run on the chunks (the ones of later workflows first, as they may need fields of earlier ones)
+        steps: list[set[int]] = [set() for _ in self._workflows]
+        for wid in reversed(range(len(self._workflows))):
+            later = list(zip(self._workflows[wid + 1:], steps[wid + 1:]))
+
+            def keep(field: str, later: list[tuple[Workflow, set[int]]] = later) -> bool:
+                return on_chunk is not None or any([w.uses_field(field, steps = s) for w, s in later])
+
+            steps[wid] = self._workflows[wid].get_stream_steps(keep)
+
+        # Stream the chunks
+        states: list[dict[int, Any]] = [{} for _ in self._workflows]
+        for i, chunk in enumerate(chunks if on_chunk is not None or any(steps) else []):
+            data = self._prepare(runtime, chunk, mapping)
+
+            for wid, workflow in enumerate(self._workflows):
+                data = workflow.transform(data, states = states[wid], steps = steps[wid])
+
+            if on_chunk:
+                on_chunk(data)
+
+            if logger:
+                logger.log(f"Streamed chunk {i + 1}")
+
+        precomputed = {w.id: w.finalize(states[wid], runtime.new_dataset) for wid, w in enumerate(self._workflows)}
+
+        # Compute the other results (and the ones depending on the partial analysers)
+        _, results = self.run(runtime     = runtime, 
+                              data        = sample, 
+                              mapping     = mapping, 
+                              tracker     = tracker, 
+                              logger      = logger,
+                              precomputed = precomputed,
+                              reused      = reused)
+
+        return results
+
+    def _prepare(self, 
+                 runtime: Runtime,
+                 data:    IDataset, 
+                 mapping: AnalysisFieldMappings) -> IDataset:
+        """
+        Verifies and maps the required fields (and projects the dataset onto
+        the used fields, if runtime.prune_fields is set)
+        """
+
         data = data.copy()
+        mapped_prefixes = []
         
         # Verify field and perform mapping
         for rfield, schema in self.get_fields().required.items():
@@ -97,27 +221,17 @@ class Analysis(Identifiable, Configurable[AnalysisConfig]):
 
             if not schema.prefix:
                 data.map_field(mapping[rfield], rfield)
+            else:
+                mapped_prefixes.append(rfield_mapped)
 
-        # Run analysis
-        results: AnalysisResults = {}
-        created_results: NamedResults = {}
-        for wid, workflow in enumerate(self._workflows):
-            if logger:
-                logger.log(f"Starting workflow '{workflow}'")
-
-            def w_tracker(sid: int, name: str) -> None:
-                if tracker:
-                    tracker(wid, sid, name)
+        # Project onto the used fields
+        if runtime.prune_fields:
+            unused = [x for x in data.fields if not any([w.uses_field(x) for w in self._workflows]) and
+                                                not any([x.startswith(p) for p in mapped_prefixes])]
+            if unused:
+                data = data.drop_fields(unused)
 
-            data, method_results, created_results = workflow.run(runtime = runtime, 
-                                                                 data = data, 
-                                                                 created_named_results = created_results,
-                                                                 tracker = w_tracker,
-                                                                 logger  = logger)
-
-            results[workflow.id] = method_results
-
-        return data, results
+        return data
 
     def get_fields(self) -> AnalysisFields:
 
@@ -129,7 +243,8 @@ class Analysis(Identifiable, Configurable[AnalysisConfig]):
         for w in self._workflows:
             fields = w.get_fields()
             
-            bad_types = {k for k,v in fields.required.items() if k in required and v.dtype is not Any and required[k].dtype is not Any and v.dtype != required[k].dtype}
+            bad_types = {k for k,v in fields.required.items() if k in required and v.dtype is not Any and required[k].dtype is not Any and 
+                                                                 not set(get_args(v.dtype) or [v.dtype]) & set(get_args(required[k].dtype) or [required[k].dtype])}
             assert not bad_types, f"Some required fields ({', '.join(list(bad_types))}) have mismatching type requirements"
             assert not (reps := {k for k in fields.created if k in required}), f"Some fields are created later than they are required: {', '.join(reps)}"
             assert not (reps := {k for k in fields.created if k in created}), f"Some fields are created repeatedly (being overwritten): {', '.join(reps)}"
@@ -0,0 +1,75 @@
+__all__ = ["DATE_BUCKETS", "bucket_dates", "sort_dates"]
+
+import numpy as np
+import pandas as pd
+from typing import Any, Iterable
+
+
+# Period frequency and label format of each bucket (weeks start on Mondays)
+DATE_BUCKETS: dict[str, tuple[str, str]] = {"day":   ("D", "%Y-%m-%d"),
+                                            "week":  ("W", "%Y-%m-%d"),
+                                            "month": ("M", "%Y-%m"),
+                                            "year":  ("Y", "%Y")}
+
+
+def bucket_dates(dates: list[Any], bucket: str | None, date_format: str | None = None) -> list[Any]:
+    """
+    Maps dates to the label of their bucket ("day", "week", "month" or
+    "year"), or returns them as they are if no bucket is given. Dates are
+    parsed with date_format (a strptime format, e.g. "%Y%m%d" for numbers
+    like 20240131) if given, otherwise strings are parsed as dates and 
+    numbers as Unix timestamps (in seconds); missing dates are mapped to
+    None.
+    """
+
+    if bucket is None:
+        return dates
+
+    if bucket not in DATE_BUCKETS:
+        raise Exception(f"Unknown date bucket '{bucket}' (expected one of {list(DATE_BUCKETS)})")
+
+    freq, fmt = DATE_BUCKETS[bucket]
+    values    = pd.Series(dates)
+
+    numeric   = pd.api.types.is_numeric_dtype(values)
+
+    # Numbers such as 20240131 would silently be read as timestamps of 1970
+    if numeric and date_format is None and _is_yyyymmdd(values):
+        raise Exception("Cannot bucket dates - numeric dates look like YYYYMMDD, not Unix timestamps (set the date format to '%Y%m%d')")
+
+    try:
+        if date_format is not None:
+            # Numbers are formatted as integers (e.g. 20240131) to be parsed
+            if numeric:
+                values = values.map(lambda x: None if pd.isna(x) else str(int(x)))
+
+            parsed = pd.to_datetime(values, format = date_format)
+        elif numeric:
+            parsed = pd.to_datetime(values, unit = "s")
+        else:
+            parsed = pd.to_datetime(values)
+    except (ValueError, TypeError) as e:
+        raise Exception(f"Cannot bucket dates - {e}")
+
+    # Only the distinct periods are formatted
+    codes, periods = pd.factorize(parsed.dt.tz_localize(None).dt.to_period(freq))
+    labels         = np.array([p.start_time.strftime(fmt) for p in periods] + [None], dtype = object)
+
+    return labels[codes].tolist()
+
+def sort_dates(dates: Iterable[Any]) -> list[Any]:
+    """
+    Sorts dates (or bucket labels), with the missing ones last
+    """
+    return sorted(dates, key = lambda x: (x is None, x))
+
+def _is_yyyymmdd(values: pd.Series) -> bool:
+    """
+    Returns whether all the (non-missing) numbers are valid YYYYMMDD dates
+    """
+
+    values = values.dropna()
+    if values.empty or not ((values >= 1000_01_01) & (values <= 9999_12_31) & (values % 1 == 0)).all():
+        return False
+
+    return bool(pd.to_datetime(values.astype("int64").astype(str), format = "%Y%m%d", errors = "coerce").notna().all())
@@ -0,0 +1,89 @@
+__all__ = ["StepCache"]
+
+import os
+import uuid
+import pickle
+import hashlib
+import json
+from typing import Any
+
+from .aliases import Result
+
+
+class StepCache:
+    """
+    Persistent, content-addressed cache of step outputs (created fields
+    and results).
+
+    Entries are stored as one file per key in the cache directory. When
+    the total size exceeds `max_bytes`, the least recently used entries
+    are evicted.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 2**30) -> None:
+        self._root      = root
+        self._max_bytes = max_bytes
+
+        os.makedirs(root, exist_ok = True)
+
+    def _get_path(self, key: str) -> str:
+        return f"{self._root}/{key}.pkl"
+
+    @staticmethod
+    def get_key(**parts: Any) -> str:
+        """
+        Returns a key (hash) of the given parts
+        """
+
+        content = json.dumps(parts, sort_keys = True, default = str)
+
+        return hashlib.blake2b(content.encode(), digest_size = 20).hexdigest()
+
+    def get(self, key: str) -> tuple[dict[str, Any], list[Result]] | None:
+        path = self._get_path(key)
+
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+
+            # Mark as recently used
+            os.utime(path)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+        return entry
+
+    def put(self, key: str, fields: dict[str, Any], results: list[Result]) -> None:
+        path = self._get_path(key)
+        temp = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        # Written atomically, as several steps (or processes) may write concurrently
+        with open(temp, "wb") as f:
+            pickle.dump((fields, results), f, protocol = pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temp, path)
+
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self._root):
+            if entry.name.endswith(".pkl"):
+                try:
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                except FileNotFoundError:
+                    continue
+
+        total = sum([x[1] for x in entries])
+
+        for _, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+            total -= size
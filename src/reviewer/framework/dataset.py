@@ -1,31 +1,210 @@
 __all__ = ["Dataset"]
 
+import re
+import hashlib
 import numpy as np
-from numpy.dtypes import ObjectDType, Float64DType, Int64DType, BoolDType
 import pandas as pd
-from pandas import DataFrame 
-from typing import Any, Type, override, get_args
+import pyarrow as pa
+from pandas import DataFrame
+from pandas.core.util.hashing import hash_array # typed, unlike its lazy re-export in pandas.util
+from scipy import sparse
+from scipy.sparse import spmatrix
+from typing import Any, Iterator, Type, override, get_args
 
 from .interface import IDataset
+from .aliases import Tokens
 
 
 class Dataset(IDataset):
+    """
+    Columnar, copy-on-write dataset.
 
-    def __init__(self, df: DataFrame) -> None:
+    Every field is stored as a read-only numpy array. Copies share these
+    buffers, while changing a field replaces only that field's buffer, so
+    that neither `copy()` nor `set_field_values()` touch the other columns.
+
+    Prefix fields (e.g. embeddings) can be stored as a single 2-D matrix
+    (dense or sparse), whose columns are exposed as virtual fields named
+    `{prefix}0`, `{prefix}1`, ...
+
+    Row subsets (filters, train / test partitions) are views: they only
+    keep an index of the selected rows, which is applied when a field is
+    read.
+    """
+
+    def __init__(self, df: DataFrame | None = None) -> None:
         super().__init__()
 
-        self._df: DataFrame = df.copy()
+        self._columns:  dict[str, np.ndarray] = {}
+        self._matrices: dict[str, np.ndarray | sparse.csr_matrix] = {}
+        self._matrix_names: dict[str, list[str]] = {}
+        self._virtual:  dict[str, tuple[str, int]] = {}
+        self._n_rows = 0
+
+        # Row selections of the column / matrix buffers (if any)
+        self._column_rows: dict[str, np.ndarray] = {}
+        self._matrix_rows: dict[str, np.ndarray] = {}
+
+        # Memoised fingerprints (field or prefix -> fingerprint)
+        self._fingerprints: dict[str | None, str] = {}
+
+        if df is not None:
+            self._n_rows = df.shape[0]
+
+            # Columns are shared with the DataFrame (no copy)
+            for column in df.columns:
+                self._columns[str(column)] = self._to_array(df[column].to_numpy())
 
         self._train_part = 1
-        self._train_idx  = []
-        self._test_idx   = []
+        self._train_mask: np.ndarray | None = None
+        self._seed:           int | None = None
+        self._stratify_field: str | None = None
 
     @override
     def __repr__(self) -> str:
-        return str(self._df.head())
+        return str(DataFrame(self.head(5).to_dict()))
 
     def _has_field(self, field: str) -> bool:
-        return field in self._df.columns
+        return field in self._columns or field in self._virtual
+
+    def _to_array(self, values: Any) -> np.ndarray:
+        if isinstance(values, np.ndarray):
+            array = values.view()
+        else:
+            array = pd.Series(values).to_numpy() # same dtype inference as DataFrame
+
+        if array.ndim != 1:
+            raise Exception("Cannot set field values - expecting a one-dimensional array")
+
+        array.flags.writeable = False
+
+        return array
+
+    def _to_matrix(self, matrix: np.ndarray | spmatrix) -> np.ndarray | sparse.csr_matrix:
+        if sparse.issparse(matrix):
+            return sparse.csr_matrix(matrix)
+
+        matrix = np.asarray(matrix).view()
+        if matrix.ndim != 2:
+            raise Exception("Cannot set matrix field - expecting a two-dimensional matrix")
+
+        matrix.flags.writeable = False
+
+        return matrix
+
+    def _get_matrix(self, prefix: str) -> np.ndarray | sparse.csr_matrix:
+        if (rows := self._matrix_rows.get(prefix)) is None:
+            return self._matrices[prefix]
+
+        return self._to_matrix(self._matrices[prefix][rows])
+
+    def _get_column(self, field: str) -> np.ndarray:
+        if field in self._columns:
+            if (rows := self._column_rows.get(field)) is None:
+                return self._columns[field]
+
+            return self._to_array(self._columns[field][rows])
+
+        prefix, i = self._virtual[field]
+        matrix = self._matrices[prefix]
+        rows   = self._matrix_rows.get(prefix, slice(None))
+
+        if isinstance(matrix, sparse.csr_matrix):
+            return self._to_array(matrix[rows][:, i].toarray().ravel())
+
+        return self._to_array(matrix[rows, i])
+
+    def _get_dtype(self, field: str) -> Any:
+        if field in self._columns:
+            return self._columns[field].dtype
+
+        return self._matrices[self._virtual[field][0]].dtype
+
+    def _get_types(self, field: str) -> set[Type[Any] | Any]:
+        dtype = self._get_dtype(field)
+
+        # Token lists are stored as objects (detected by the first row)
+        if _is_dtype(dtype, np.object_) and field in self._columns and self._n_rows > 0:
+            rows = self._column_rows.get(field)
+            if isinstance(self._columns[field][0 if rows is None else rows[0]], list):
+                return {Tokens}
+
+        return self._match_dtype(dtype)
+
+    def _is_empty(self) -> bool:
+        return not self._columns and not self._matrices
+
+    def _update_virtual(self) -> None:
+        self._virtual = {name: (prefix, i) for prefix, names in self._matrix_names.items()
+                                           for i, name in enumerate(names)}
+
+    def _invalidate(self, field: str) -> None:
+        self._fingerprints = {k: v for k, v in self._fingerprints.items() 
+                                   if k is None or not field.startswith(k)}
+
+    def _hash(self, values: np.ndarray | sparse.csr_matrix) -> str:
+        h = hashlib.blake2b(digest_size = 16)
+        h.update(f"{values.shape}{values.dtype}".encode())
+
+        if isinstance(values, sparse.csr_matrix):
+            for buffer in [values.indptr, values.indices, values.data]:
+                h.update(np.ascontiguousarray(buffer).tobytes())
+
+        elif values.dtype == object:
+            try:
+                h.update(hash_array(values.ravel()).tobytes())
+            except TypeError:
+                # Token lists are hashed by a stable encoding (as they are not hashable)
+                encoded = np.empty(values.size, dtype = object)
+                encoded[:] = [_encode_tokens(x) if isinstance(x, list) else x for x in values.ravel()]
+
+                h.update(hash_array(encoded).tobytes())
+
+        else:
+            h.update(np.ascontiguousarray(values).tobytes())
+
+        return h.hexdigest()
+
+    def _view(self) -> 'Dataset':
+        new_ds = Dataset()
+        new_ds._columns      = dict(self._columns)
+        new_ds._matrices     = dict(self._matrices)
+        new_ds._matrix_names = dict(self._matrix_names)
+        new_ds._virtual      = self._virtual
+        new_ds._column_rows  = dict(self._column_rows)
+        new_ds._matrix_rows  = dict(self._matrix_rows)
+        new_ds._fingerprints = {k: v for k, v in self._fingerprints.items() if k is not None}
+        new_ds._n_rows       = self._n_rows
+
+        return new_ds
+
+    def _take(self, idx: np.ndarray) -> 'Dataset':
+        """
+        Returns a view of the rows `idx` (without partition). Only the row
+        selections are composed, the column buffers are shared.
+        """
+        new_ds = self._view()
+        new_ds._n_rows = len(idx)
+
+        idx = np.asarray(idx, dtype = np.int64)
+        idx.flags.writeable = False
+
+        composed: dict[int, np.ndarray] = {}
+        def compose(rows: np.ndarray | None) -> np.ndarray:
+            if rows is None:
+                return idx
+
+            if id(rows) not in composed:
+                composed[id(rows)] = rows[idx]
+                composed[id(rows)].flags.writeable = False
+
+            return composed[id(rows)]
+
+        new_ds._column_rows  = {k: compose(self._column_rows.get(k)) for k in self._columns}
+        new_ds._matrix_rows  = {k: compose(self._matrix_rows.get(k)) for k in self._matrices}
+        new_ds._fingerprints = {}
+
+        return new_ds
 
     def _match_dtype(self, dtype: Any) -> set[Type[Any] | Any]:
 
@@ -33,44 +212,65 @@ class Dataset(IDataset):
 
         dtypes = set()
         for arg in args:
-        
-            if dtype is Any: 
-                return set(Any)
 
-            if isinstance(arg, Float64DType) or arg is float:
+            if dtype is Any:
+                return {Any}
+
+            if _is_dtype(arg, np.floating) or arg is float:
                 dtypes.add(float)
 
-            if isinstance(arg, Int64DType) or arg is int:
+            if _is_dtype(arg, np.integer) or arg is int:
                 dtypes.add(int)
 
-            if isinstance(arg, BoolDType) or arg is bool:
+            if _is_dtype(arg, np.bool_) or arg is bool:
                 dtypes.add(bool)
 
-            if isinstance(arg, ObjectDType) or arg is str:
+            if _is_dtype(arg, np.object_) or arg is str:
                 dtypes.add(str)
 
+            if arg is Tokens:
+                dtypes.add(Tokens)
+
         return dtypes
 
+    @property
+    def n_rows(self) -> int:
+        return self._n_rows
+
     @override
     def apply_filter(self, sql_rule: str) -> 'Dataset':
 
-        if self._df is None:
-            return self
-
-        self._df = self._df.query(sql_rule).reset_index(drop=True)
+        # Only the fields used by the rule are handed to pandas
+        used = {k: self._get_column(k) for k in [*self._columns, *self._virtual]
+                    if re.search(rf"(?<![\w`]){re.escape(k)}(?![\w`])|`{re.escape(k)}`", sql_rule)}
+        mask = DataFrame(used, index = pd.RangeIndex(self._n_rows)).eval(sql_rule)
+        mask = np.broadcast_to(np.asarray(mask, dtype = bool), (self._n_rows,))
 
-        if len(self._train_idx):
-            self._train_idx = [x for x in self._train_idx if x in self._df.index]
+        filtered = self._take(np.flatnonzero(mask))
+        self._column_rows  = filtered._column_rows
+        self._matrix_rows  = filtered._matrix_rows
+        self._n_rows       = filtered._n_rows
+        self._fingerprints = {}
 
-        if len(self._test_idx):
-            self._test_idx  = [x for x in self._test_idx if x in self._df.index]
+        if self._train_mask is not None:
+            self._train_mask = self._train_mask[mask]
 
         return self
 
     @override
     def map_field(self, field: str, mapped_name: str) -> 'Dataset':
-        if not self._has_field(mapped_name):
-            self._df[mapped_name] = self._df[field]
+        if self._has_field(mapped_name):
+            return self
+
+        self._invalidate(mapped_name)
+
+        if field in self._columns:
+            self._columns[mapped_name] = self._columns[field]
+
+            if field in self._column_rows:
+                self._column_rows[mapped_name] = self._column_rows[field]
+        else:
+            self._columns[mapped_name] = self._get_column(field)
 
         return self
 
@@ -82,14 +282,40 @@ class Dataset(IDataset):
         if dtype is Any:
             return True
 
-        required = self._match_dtype(self._df[field].dtype)  
+        required = self._get_types(field)
         provided = self._match_dtype(dtype)
 
         return Any in provided or len(required & provided) > 0
 
     @override
     def drop_fields(self, fields: list[str]) -> 'Dataset':
-        self._df = self._df.drop(columns = fields)
+        if (missing := [x for x in fields if not self._has_field(x)]):
+            raise Exception(f"Cannot drop missing fields: {', '.join(missing)}")
+
+        dropped: dict[str, set[int]] = {}
+        for field in fields:
+            self._invalidate(field)
+
+            if field in self._columns:
+                del self._columns[field]
+                self._column_rows.pop(field, None)
+            else:
+                prefix, i = self._virtual[field]
+                dropped.setdefault(prefix, set()).add(i)
+
+        # Matrices are only sliced if some of their columns are kept
+        for prefix, idx in dropped.items():
+            keep = [i for i in range(len(self._matrix_names[prefix])) if i not in idx]
+
+            if not keep:
+                del self._matrices[prefix]
+                del self._matrix_names[prefix]
+                self._matrix_rows.pop(prefix, None)
+            else:
+                self._matrices[prefix]     = self._to_matrix(self._matrices[prefix][:, keep])
+                self._matrix_names[prefix] = [self._matrix_names[prefix][i] for i in keep]
+
+        self._update_virtual()
 
         return self
 
@@ -98,94 +324,354 @@ class Dataset(IDataset):
         if not self._has_field(field):
             return []
 
-        values = self._df[field].tolist()
-        if not isinstance(values, list):
-            return []
-
-        return values
+        return self._get_column(field).tolist()
 
     @override
-    def set_field_values(self, field: str, values: list[Any]) -> None:
-        if not len(values) == self._df.shape[0]:
+    def set_field_values(self, field: str, values: list[Any] | np.ndarray) -> None:
+        if not self._is_empty() and not len(values) == self._n_rows:
             raise Exception("Cannot set field values - invalid list length")
 
-        self._df[field] = values
+        if field in self._virtual:
+            raise Exception(f"Cannot set field values - '{field}' is a column of a matrix field")
+
+        self._columns[field] = self._to_array(values)
+        self._column_rows.pop(field, None)
+        self._invalidate(field)
+        self._n_rows = len(values)
+
+    @override
+    def get_matrix_field(self, prefix: str) -> np.ndarray | sparse.csr_matrix:
+
+        # Stored matrix (zero-copy)
+        if prefix in self._matrices:
+            shadowed = [x for x in self._columns if x.startswith(prefix)] + \
+                       [x for x in self._matrix_names if x != prefix and x.startswith(prefix)]
+
+            if not shadowed:
+                return self._get_matrix(prefix)
+
+        # Assemble matrix from all the fields sharing the prefix
+        blocks = []
+        for field in self._columns:
+            if field.startswith(prefix):
+                blocks.append(self._get_column(field).astype(float).reshape(-1, 1))
+
+        for mprefix, names in self._matrix_names.items():
+            idx = [i for i, name in enumerate(names) if name.startswith(prefix)]
+            if idx:
+                matrix = self._get_matrix(mprefix)
+                blocks.append(matrix if len(idx) == len(names) else matrix[:, idx])
+
+        if not blocks:
+            return np.empty((self._n_rows, 0))
+
+        if any([sparse.issparse(x) for x in blocks]):
+            return sparse.csr_matrix(sparse.hstack(blocks, format = "csr"))
+
+        return np.hstack(blocks)
+
+    @override
+    def set_matrix_field(self, prefix: str, matrix: np.ndarray | spmatrix) -> None:
+        if not self._is_empty() and not matrix.shape[0] == self._n_rows:
+            raise Exception("Cannot set matrix field - invalid number of rows")
+
+        names = [f"{prefix}{i}" for i in range(matrix.shape[1])]
+
+        # Replace previous fields of the same name
+        if prefix in self._matrices:
+            self.drop_fields(self._matrix_names[prefix])
+
+        if (existing := [x for x in names if self._has_field(x)]):
+            self.drop_fields(existing)
+
+        self._matrices[prefix]     = self._to_matrix(matrix)
+        self._matrix_names[prefix] = names
+        self._matrix_rows.pop(prefix, None)
+        self._n_rows = matrix.shape[0]
+
+        for name in [prefix, *names]:
+            self._invalidate(name)
+
+        self._update_virtual()
+
+    @override
+    def fingerprint(self, field: str | None = None) -> str:
+        if field in self._fingerprints:
+            return self._fingerprints[field]
+
+        if field is None:
+            mask = self._train_mask if self._train_mask is not None else np.ones(self._n_rows, dtype = bool)
+            fingerprint = self._hash(mask)
+
+        elif self._has_field(field):
+            fingerprint = self._hash(self._get_column(field))
 
-        self._df = self._df.copy() # prevent fragmentation
+        else:
+            # Fields sharing the prefix (a stored matrix is hashed as a whole)
+            h = hashlib.blake2b(digest_size = 16)
+            for name in self._columns:
+                if name.startswith(field):
+                    h.update(f"{name}:{self.fingerprint(name)}".encode())
+
+            for prefix, names in self._matrix_names.items():
+                if (idx := [i for i, x in enumerate(names) if x.startswith(field)]):
+                    matrix = self._get_matrix(prefix)
+                    h.update(f"{prefix}:{idx}:{self._hash(matrix)}".encode())
+
+            fingerprint = h.hexdigest()
+
+        self._fingerprints[field] = fingerprint
+
+        return fingerprint
 
     @override
-    def partition_train_data(self, train_part: float) -> None:
+    def partition_train_data(self,
+                             train_part:     float,
+                             seed:           int | None = None,
+                             stratify_field: str | None = None) -> None:
         if self._train_part != 1:
             return
 
         if train_part <= 0 or train_part > 1:
             raise Exception("Invalid train_part (expecting value between 0 and 1)")
 
-        self._train_part = train_part
-        self._train_idx = np.random.choice(list(self._df.index), 
-                                           int(self._df.shape[0] * train_part), 
-                                           replace = False)
+        if stratify_field is not None and not self._has_field(stratify_field):
+            raise Exception(f"Invalid stratify_field (field '{stratify_field}' is missing)")
+
+        rng  = np.random.default_rng(seed)
+        mask = np.zeros(self._n_rows, dtype = bool)
+
+        if stratify_field is None:
+            mask[rng.choice(self._n_rows, int(self._n_rows * train_part), replace = False)] = True
+        else:
+            # Shuffle rows within each stratum and keep its first share
+            strata, _ = pd.factorize(self._get_column(stratify_field), use_na_sentinel = False)
+            order     = np.lexsort((rng.random(self._n_rows), strata))
+            counts    = np.bincount(strata)
+            starts    = np.cumsum(counts) - counts
+            quotas    = np.round(counts * train_part).astype(np.int64)
+
+            sorted_strata = strata[order]
+            rank          = np.arange(self._n_rows) - starts[sorted_strata]
+            mask[order[rank < quotas[sorted_strata]]] = True
+
+        mask.flags.writeable = False
+
+        self._train_part     = train_part
+        self._train_mask     = mask
+        self._seed           = seed
+        self._stratify_field = stratify_field
 
-        self._test_idx = [x for x in self._df.index if x not in self._train_idx]
+        self._fingerprints.pop(None, None)
 
     @property
     @override
     def train_data(self) -> 'Dataset':
-        if not len(self._train_idx):
-            return Dataset(self._df.copy())
+        if self._train_mask is None:
+            return self._view()
 
-        return Dataset(self._df.loc[self._train_idx, :].copy().reset_index(drop=True))
+        return self._take(np.flatnonzero(self._train_mask))
 
     @property
     @override
     def test_data(self) -> 'Dataset':
-        if not len(self._test_idx):
-            return Dataset(self._df.copy())
+        if self._train_mask is None or self._train_mask.all():
+            return self._view()
 
-        return Dataset(self._df.loc[self._test_idx, :].copy().reset_index(drop=True))
+        return self._take(np.flatnonzero(~self._train_mask))
 
     @property
     @override
     def fields(self) -> dict[str, Type[Any]]:
-        return {str(k): self._match_dtype(self._df[k].dtype).pop() for k in self._df.columns}
+        fields = {k: self._get_types(k).pop() for k in self._columns}
+
+        for prefix, names in self._matrix_names.items():
+            dtype = self._match_dtype(self._matrices[prefix].dtype).pop()
+            fields.update({name: dtype for name in names})
+
+        return fields
 
     @override
     def copy(self) -> 'Dataset':
-        new_ds = Dataset(self._df.copy())
+        new_ds = self._view()
 
         if self._train_part != 1:
-            new_ds._train_part = self._train_part
-            new_ds._train_idx  = self._train_idx
-            new_ds._test_idx   = self._test_idx
+            new_ds._train_part     = self._train_part
+            new_ds._train_mask     = self._train_mask
+            new_ds._seed           = self._seed
+            new_ds._stratify_field = self._stratify_field
+
+            if None in self._fingerprints:
+                new_ds._fingerprints[None] = self._fingerprints[None]
 
         return new_ds
 
     @override
     def head(self, n: int) -> 'Dataset':
         if n > 0:
-            new_ds = Dataset(self._df.head(n).copy())
+            new_ds = self._take(np.arange(min(n, self._n_rows)))
         else:
             return self.copy()
 
         if self._train_part != 1:
-            new_ds.partition_train_data(train_part = self._train_part)
+            new_ds.partition_train_data(train_part     = self._train_part,
+                                        seed           = self._seed,
+                                        stratify_field = self._stratify_field)
 
         return new_ds
 
     @override
     def to_dict(self) -> dict[str, list[Any]]:
-        return self._df.to_dict("list")
+        return {k: self._get_column(k).tolist() for k in self.fields}
 
     @staticmethod
     def new(fields: dict[str, list[Any]]) -> 'Dataset':
-        df = DataFrame(fields)
+        ds = Dataset()
 
-        return Dataset(df)
+        for field, values in fields.items():
+            ds.set_field_values(field, values)
+
+        return ds
+
+    @staticmethod
+    def from_arrow(table: pa.Table) -> 'Dataset':
+        """
+        Creates a dataset sharing the buffers of an Arrow table. Numeric
+        columns without missing values are not copied, other columns are
+        converted as by pandas.
+        """
+
+        ds = Dataset()
+        ds._n_rows = table.num_rows
+
+        for name, column in zip(table.column_names, table.columns):
+            zero_copy = column.num_chunks == 1 and column.null_count == 0 and \
+                        (pa.types.is_integer(column.type) or pa.types.is_floating(column.type))
+
+            if zero_copy:
+                values = column.chunk(0).to_numpy(zero_copy_only = True)
+            else:
+                values = column.to_pandas().to_numpy()
+
+            ds._columns[str(name)] = ds._to_array(values)
+
+        return ds
 
     @staticmethod
-    def from_path(path: str, sep: str = ";", dec: str = ",") -> 'Dataset':
-        df: DataFrame = pd.read_csv(path, sep=sep, decimal=dec)
+    def from_path(path:     str, 
+                  sep:      str = ";", 
+                  dec:      str = ",",
+                  columns:  list[str] | None = None,
+                  max_rows: int | None = None) -> 'Dataset':
+        """
+        Loads a dataset from a CSV file or an Arrow IPC file (.arrow). 
+        Arrow files are memory-mapped, so that datasets loaded several
+        times share their pages.
+        """
+
+        if path.endswith(".arrow"):
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+
+            if columns is not None:
+                table = table.select([x for x in table.column_names if x in set(columns)])
+
+            if max_rows:
+                table = table.slice(0, max_rows)
+
+            return Dataset.from_arrow(table)
+
+        df: DataFrame = pd.read_csv(path, 
+                                    sep     = sep, 
+                                    decimal = dec,
+                                    usecols = (lambda x: x in columns) if columns is not None else None,
+                                    nrows   = max_rows or None)
 
         return Dataset(df)
 
+    @staticmethod
+    def iter_path(path:       str, 
+                  chunk_size: int = 100_000,
+                  sep:        str = ";", 
+                  dec:        str = ",",
+                  columns:    list[str] | None = None) -> Iterator['Dataset']:
+        """
+        Reads a dataset from a CSV file or an Arrow IPC file (.arrow) in 
+        chunks of `chunk_size` rows. Arrow files are memory-mapped, so that
+        only the pages of the chunks in use are resident.
+        """
+
+        if path.endswith(".arrow"):
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+
+            if columns is not None:
+                table = table.select([x for x in table.column_names if x in set(columns)])
+
+            for offset in range(0, table.num_rows, chunk_size):
+                yield Dataset.from_arrow(table.slice(offset, chunk_size))
 
+            return
+
+        for df in pd.read_csv(path, 
+                              sep       = sep, 
+                              decimal   = dec,
+                              usecols   = (lambda x: x in columns) if columns is not None else None,
+                              chunksize = chunk_size):
+            yield Dataset(df)
+
+    @staticmethod
+    def sample_path(path:    str, 
+                    n_rows:  int,
+                    sep:     str = ";", 
+                    dec:     str = ",",
+                    columns: list[str] | None = None,
+                    seed:    int | None = None) -> 'Dataset':
+        """
+        Loads a uniform random sample of `n_rows` rows (in file order) from
+        a CSV file or an Arrow IPC file (.arrow), without loading the whole
+        file into memory.
+        """
+
+        rng = np.random.default_rng(seed)
+
+        if path.endswith(".arrow"):
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+
+            if columns is not None:
+                table = table.select([x for x in table.column_names if x in set(columns)])
+
+            if table.num_rows > n_rows:
+                table = table.take(np.sort(rng.choice(table.num_rows, size = n_rows, replace = False)))
+
+            return Dataset.from_arrow(table)
+
+        # Rows with the smallest random keys are kept (reservoir sampling)
+        sample: DataFrame | None = None
+        for df in pd.read_csv(path, 
+                              sep       = sep, 
+                              decimal   = dec,
+                              usecols   = (lambda x: x in columns) if columns is not None else None,
+                              chunksize = max(n_rows, 10_000)):
+
+            df     = df.assign(_sample_key = rng.random(len(df)))
+            sample = (df if sample is None else pd.concat([sample, df])).nsmallest(n_rows, "_sample_key")
+
+        if sample is None:
+            return Dataset.from_path(path, sep = sep, dec = dec, columns = columns)
+
+        return Dataset(sample.sort_index().drop(columns = "_sample_key"))
+
+def _encode_tokens(tokens: list[Any]) -> str:
+    """
+    Encodes a token list as a string: its length and the tokens joined by
+    a separator not found in tokens (so that different lists differ)
+    """
+    return f"{len(tokens)}\x00" + "\x00".join([str(x) for x in tokens])
+
+def _is_dtype(dtype: Any, kind: type[np.generic]) -> bool:
+    """
+    Returns whether dtype is a numpy dtype of the kind (e.g. np.floating)
+    """
+    return isinstance(dtype, np.dtype) and np.issubdtype(dtype, kind)
@@ -1,10 +1,12 @@
 from .ilogger import *
+from .imodelstore import *
 from .iconfig import *
 from .iresultcreator import *
 from .ipreprocessor import *
 from .iembedder import *
 from .ievaluator import *
 from .ianalyser import *
+from .ipartialanalyser import *
 from .ipredictor import *
 from .ivisualizer import *
 from .imethod import *
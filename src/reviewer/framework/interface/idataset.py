@@ -1,5 +1,7 @@
 __all__ = ["IDataset"]
 
+import numpy as np
+from scipy.sparse import csr_matrix, spmatrix
 from abc import ABC, abstractmethod
 from typing import Any, Type
 
@@ -27,11 +29,31 @@ class IDataset(ABC):
         raise NotImplementedError("abstract method")
 
     @abstractmethod
-    def set_field_values(self, field: str, values: list[Any]) -> None:
+    def set_field_values(self, field: str, values: list[Any] | np.ndarray) -> None:
         raise NotImplementedError("abstract method")
 
     @abstractmethod
-    def partition_train_data(self, train_part: float) -> None:
+    def get_matrix_field(self, prefix: str) -> np.ndarray | csr_matrix:
+        raise NotImplementedError("abstract method")
+
+    @abstractmethod
+    def set_matrix_field(self, prefix: str, matrix: np.ndarray | spmatrix) -> None:
+        raise NotImplementedError("abstract method")
+
+    @abstractmethod
+    def fingerprint(self, field: str | None = None) -> str:
+        """
+        Returns a fingerprint of a field's values (or of all the fields 
+        sharing a prefix), or of the train / test partition if no field
+        is given
+        """
+        raise NotImplementedError("abstract method")
+
+    @abstractmethod
+    def partition_train_data(self,
+                             train_part:     float,
+                             seed:           int | None = None,
+                             stratify_field: str | None = None) -> None:
         raise NotImplementedError("abstract method")
 
     @property
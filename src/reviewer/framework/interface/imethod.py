@@ -1,7 +1,7 @@
 __all__ = ["IMethod"]
 
 from abc import abstractmethod
-from typing import TypeVar
+from typing import Any, TypeVar
 
 from ..interface import IConfig
 from ..trait import Identifiable, Configurable
@@ -15,6 +15,34 @@ class IMethod(Identifiable, Configurable[T]):
     def __init__(self, config:  T | None = None) -> None:
         super().__init__()
 
+        self._messages: list[str] = []
+
+    def note(self, msg: str) -> None:
+        """
+        Notes a message for the run log
+        """
+        self._messages.append(msg)
+
+    def pop_messages(self) -> list[str]:
+        """
+        Returns (and forgets) the messages noted since the last call
+        """
+        messages, self._messages = self._messages, []
+        return messages
+
+    def get_state(self) -> dict[str, Any]:
+        """
+        Returns the fitted state of the method (its attributes, except for
+        its identity, configuration and notes), e.g. to store trained models
+        """
+        return {k: v for k, v in vars(self).items() if k not in ("_id", "_name", "_config", "_messages")}
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        """
+        Restores a fitted state (see `get_state`)
+        """
+        vars(self).update(state)
+
     @abstractmethod
     def get_required_fields(self) -> dict[AnalysisField, FieldSchema]:
         raise NotImplementedError("abstract method")
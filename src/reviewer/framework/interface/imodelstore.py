@@ -0,0 +1,25 @@
+__all__ = ["IModelStore"]
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class IModelStore(ABC):
+    """
+    Store of fitted models (the states of trained embedders and
+    predictors). Models are saved under a key of their lineage and
+    training data, and under a name of their lineage only, whose latest
+    model is used when nothing may be trained (predict-only runs).
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> Any | None:
+        raise NotImplementedError("abstract method")
+
+    @abstractmethod
+    def load_latest(self, name: str) -> Any | None:
+        raise NotImplementedError("abstract method")
+
+    @abstractmethod
+    def save(self, key: str, name: str, state: Any, info: dict[str, Any]) -> None:
+        raise NotImplementedError("abstract method")
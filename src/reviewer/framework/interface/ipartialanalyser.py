@@ -0,0 +1,43 @@
+__all__ = ["IPartialAnalyser"]
+
+from abc import abstractmethod
+from typing import TypeVar, Any, Callable, override
+
+from .ianalyser import IAnalyser
+from .idataset import IDataset 
+from .iconfig import IConfig
+
+from ..aliases import Result
+
+T = TypeVar('T', bound=IConfig)
+
+
+class IPartialAnalyser(IAnalyser[T]):
+    """
+    Analyser computing its results from mergeable partial states of chunks
+    of the dataset (map-reduce): analysing a dataset is the same as
+    finalising the merged partial states of its chunks.
+
+    `merge` may update and return its first state.
+    """
+
+    @abstractmethod
+    def partial(self, data: IDataset) -> Any:
+        raise NotImplementedError("abstract method")
+
+    @abstractmethod
+    def merge(self, a: Any, b: Any) -> Any:
+        raise NotImplementedError("abstract method")
+
+    @abstractmethod
+    def finalize(self, 
+                 state: Any, 
+                 new_dataset: Callable[[dict[str, list[Any]]], IDataset]) -> list[Result]:
+        raise NotImplementedError("abstract method")
+
+    @override
+    def analyse(self, 
+                data: IDataset, 
+                results: dict[str, Result],
+                new_dataset: Callable[[dict[str, list[Any]]], IDataset]) -> list[Result]:
+        return self.finalize(self.partial(data), new_dataset)
@@ -0,0 +1,88 @@
+__all__ = ["ModelStore"]
+
+import os
+import uuid
+import json
+import joblib
+from datetime import datetime, timezone
+from typing import Any, Callable, override
+
+from .interface import IModelStore
+
+
+class ModelStore(IModelStore):
+    """
+    Directory of fitted models: one joblib file (and one json file of
+    information) per key, and one file per name referencing the key of
+    the latest model saved under it.
+    """
+
+    def __init__(self, root: str) -> None:
+        self._root = root
+
+        os.makedirs(root, exist_ok = True)
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    def _get_path(self, key: str, extension: str) -> str:
+        return f"{self._root}/{key}.{extension}"
+
+    @override
+    def load(self, key: str) -> Any | None:
+        try:
+            return joblib.load(self._get_path(key, "joblib"))
+        except (FileNotFoundError, EOFError, ValueError):
+            return None
+
+    @override
+    def load_latest(self, name: str) -> Any | None:
+        try:
+            with open(self._get_path(name, "latest"), "r") as f:
+                key = f.read().strip()
+        except FileNotFoundError:
+            return None
+
+        return self.load(key)
+
+    @override
+    def save(self, key: str, name: str, state: Any, info: dict[str, Any]) -> None:
+        info = {**info, "key": key, "name": name, "created_at": datetime.now(timezone.utc).isoformat()}
+
+        self._write(self._get_path(key, "joblib"), lambda path: joblib.dump(state, path))
+        self._write(self._get_path(key, "json"),   lambda path: self._dump_json(path, info))
+        self._write(self._get_path(name, "latest"), lambda path: self._dump_text(path, key))
+
+    def get_infos(self) -> list[dict[str, Any]]:
+        """
+        Returns the information of all the stored models
+        """
+
+        infos = []
+        for entry in os.scandir(self._root):
+            if entry.name.endswith(".json"):
+                try:
+                    with open(entry.path, "r") as f:
+                        infos.append(json.load(f))
+                except (FileNotFoundError, json.JSONDecodeError):
+                    continue
+
+        return infos
+
+    def _write(self, path: str, write: Callable[[str], Any]) -> None:
+        temp = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        # Written atomically, as several runs (or processes) may save the same model
+        write(temp)
+        os.replace(temp, path)
+
+    @staticmethod
+    def _dump_json(path: str, content: dict[str, Any]) -> None:
+        with open(path, "w") as f:
+            json.dump(content, f, indent = 2, default = str)
+
+    @staticmethod
+    def _dump_text(path: str, content: str) -> None:
+        with open(path, "w") as f:
+            f.write(content)
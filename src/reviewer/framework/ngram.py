@@ -0,0 +1,118 @@
+__all__ = ["NgramCounts", "count_ngrams", "merge_ngram_counts"]
+
+import numpy as np
+import pandas as pd
+from collections import Counter
+from string import punctuation
+from nltk import word_tokenize
+from typing import Any
+
+from .unique import UniqueValues
+from .sketch import HeavyHitterSketch
+
+
+_PUNCTUATION = {x for x in punctuation}
+
+# Exact or approximate (sketched) n-gram counts
+NgramCounts = Counter | HeavyHitterSketch
+
+
+def count_ngrams(texts:       list[Any],
+                 ngram_range: tuple[int, int],
+                 groups:      list[Any] | None = None) -> dict[Any, Counter]:
+    """
+    Counts the n-grams (of the lengths in ngram_range, skipping the ones
+    containing punctuation) of texts or token lists, per group of texts
+    (None, if no groups are given).
+
+    The counters list the n-grams in order of first occurrence, so that
+    ties are ordered as if the n-grams were counted one by one.
+    """
+
+    # Distinct texts are tokenised once
+    unique = UniqueValues(texts)
+    docs   = [x if isinstance(x, list) else word_tokenize(x) for x in unique.values]
+
+    ids, vocab = pd.factorize(pd.Series([w for doc in docs for w in doc], dtype = object))
+    vocab      = np.asarray(vocab, dtype = object)
+    lengths    = np.array([len(doc) for doc in docs], dtype = np.int64)
+    offsets    = np.cumsum(lengths) - lengths
+
+    # Token ids of all the texts, in order
+    doc_lengths = lengths[unique.codes]
+    doc_starts  = np.cumsum(doc_lengths) - doc_lengths
+    n_tokens    = int(doc_lengths.sum())
+
+    positions = np.repeat(offsets[unique.codes] - doc_starts, doc_lengths) + np.arange(n_tokens)
+    tokens    = ids[positions].astype(np.int64)
+    doc       = np.repeat(np.arange(len(doc_lengths)), doc_lengths)
+
+    # Running count of punctuation tokens
+    is_punct = np.array([x in _PUNCTUATION for x in vocab], dtype = bool)
+    n_punct  = np.concatenate([[0], np.cumsum(is_punct[tokens])])
+
+    if groups is None:
+        group_codes, group_values = np.zeros(len(texts), dtype = np.int64), [None]
+    else:
+        group_codes, group_values = pd.factorize(pd.Series(groups, dtype = object), use_na_sentinel = False)
+
+    found: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+
+    # n-grams of length n are coded by their (n-1)-gram code and last token
+    codes = tokens
+    for n in range(1, ngram_range[1] + 1):
+        m = n_tokens - n + 1
+        if m <= 0:
+            break
+
+        if n > 1:
+            codes, _ = pd.factorize(codes[:m] * max(len(vocab), 1) + tokens[n-1:])
+
+        if n < ngram_range[0]:
+            continue
+
+        starts = np.flatnonzero((doc[:m] == doc[n-1:]) & (n_punct[n:n+m] == n_punct[:m]))
+        keys   = group_codes[doc[starts]] * (int(codes.max()) + 1) + codes[starts]
+
+        _, first, counts = np.unique(keys, return_index = True, return_counts = True)
+        first = starts[first]
+
+        phrases = vocab[tokens[first]]
+        for k in range(1, n):
+            phrases = phrases + " " + vocab[tokens[first + k]]
+
+        # Order of first occurrence: n-grams are counted at their last token, shorter ones first
+        found.append((group_codes[doc[first]], (first + n - 1) * (ngram_range[1] + 1) + n, phrases, counts))
+
+    counters: dict[Any, Counter] = {x: Counter() for x in group_values}
+
+    if found:
+        group   = np.concatenate([x[0] for x in found])
+        order   = np.concatenate([x[1] for x in found])
+        phrases = np.concatenate([x[2] for x in found])
+        counts  = np.concatenate([x[3] for x in found])
+
+        # Sorted by group, then by first occurrence
+        idx    = np.lexsort((order, group))
+        bounds = np.searchsorted(group[idx], np.arange(len(group_values) + 1))
+
+        for g, value in enumerate(group_values):
+            rows = idx[bounds[g]:bounds[g+1]]
+            counters[value] = Counter(dict(zip(phrases[rows].tolist(), counts[rows].tolist())))
+
+    return counters
+
+def merge_ngram_counts(a: NgramCounts, b: NgramCounts) -> NgramCounts:
+    """
+    Adds the n-gram counts b to a (in place), both being exact or both
+    being approximate
+    """
+
+    if isinstance(a, HeavyHitterSketch) and isinstance(b, HeavyHitterSketch):
+        return a.merge(b)
+
+    if isinstance(a, Counter) and isinstance(b, Counter):
+        a.update(b)
+        return a
+
+    raise Exception("Cannot merge exact and approximate n-gram counts")
@@ -3,17 +3,28 @@ __all__ = ["Runtime"]
 from matplotlib.colors import Colormap, LinearSegmentedColormap
 from typing import Any, Callable, Generator
 
-from .interface import IDataset, IFigure
+from .interface import IDataset, IFigure, IModelStore
+from .cache import StepCache
 
 class Runtime:
 
     def __init__(self, 
                  dataset_constructor: Callable[[dict[str, Any]], IDataset],
                  figure_constructor: Callable[[Any], IFigure],
-                 colors: list[str] | None = None) -> None:
+                 colors: list[str] | None = None,
+                 max_workers: int = 4,
+                 step_cache: StepCache | None = None,
+                 prune_fields: bool = False,
+                 model_store: IModelStore | None = None,
+                 predict_only: bool = False) -> None:
 
         self._dataset_constructor = dataset_constructor
         self._figure_constructor  = figure_constructor
+        self._max_workers         = max_workers
+        self._step_cache          = step_cache
+        self._prune_fields        = prune_fields
+        self._model_store         = model_store
+        self._predict_only        = predict_only
 
         self._colors = colors or ['#1D3557', '#457B9D', '#A8DADC', '#F1FAEE', '#E63946']
 
@@ -45,6 +56,45 @@ class Runtime:
     def palette(self) -> Callable[[], Generator[str, None, None]]:
         return self._get_colors
 
+    @property
+    def max_workers(self) -> int:
+        """
+        Maximum number of workflow steps run concurrently
+        """
+        return self._max_workers
+
+    @property
+    def step_cache(self) -> StepCache | None:
+        """
+        Cache of step outputs (if any)
+        """
+        return self._step_cache
+
+    @property
+    def prune_fields(self) -> bool:
+        """
+        Whether fields are dropped as soon as no later step uses them
+        (the dataset returned by an analysis then only keeps the fields
+        that are used until its end)
+        """
+        return self._prune_fields
+
+    @property
+    def model_store(self) -> IModelStore | None:
+        """
+        Store of fitted models (if any): trained embedders and predictors
+        are saved to it and reused when trained on the same data again
+        """
+        return self._model_store
+
+    @property
+    def predict_only(self) -> bool:
+        """
+        Whether embedders and predictors must not be trained (the latest
+        stored models of the same steps are used instead)
+        """
+        return self._predict_only
+
     @property 
     def colormap(self) -> Colormap:
         return LinearSegmentedColormap.from_list("", self._colors)
@@ -0,0 +1,122 @@
+__all__ = ["QuantileSketch", "HeavyHitterSketch"]
+
+import heapq
+import numpy as np
+from collections import Counter
+from typing import Any, Iterable, Mapping
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch of discrete values (e.g. ratings). It keeps
+    the count of every distinct value, so that histograms and quantiles 
+    (as by np.quantile with linear interpolation) are exact.
+    """
+
+    def __init__(self, counts: Counter | None = None) -> None:
+        self._counts: Counter = counts or Counter()
+
+    @property
+    def counts(self) -> Counter:
+        return self._counts
+
+    @property
+    def n(self) -> int:
+        return self._counts.total()
+
+    def update(self, values: Iterable[Any]) -> 'QuantileSketch':
+        self._counts.update(values)
+
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        return QuantileSketch(self._counts + other._counts)
+
+    def quantiles(self, qs: list[float]) -> list[float]:
+        if not self._counts:
+            return [float("nan")] * len(qs)
+
+        values = np.array(sorted(self._counts), dtype = float)
+        ends   = np.cumsum([self._counts[x] for x in sorted(self._counts)])
+
+        # Positions in the sorted values and their neighbours
+        h  = (ends[-1] - 1) * np.asarray(qs, dtype = float)
+        lo = np.floor(h)
+        x0 = values[np.searchsorted(ends, lo, side = "right")]
+        x1 = values[np.searchsorted(ends, np.minimum(lo + 1, ends[-1] - 1), side = "right")]
+
+        return [float(x) for x in x0 + (h - lo) * (x1 - x0)]
+
+
+class HeavyHitterSketch:
+    """
+    Mergeable Space-Saving sketch of the most frequent items. It keeps at
+    most `size` counters, so its memory does not depend on the number of
+    distinct items. Counts are overestimated by at most their error (and
+    by at most n / size), and every item more frequent than n / size is
+    kept.
+    """
+
+    def __init__(self, size: int) -> None:
+        if size <= 0:
+            raise Exception("The size of a heavy hitter sketch must be positive")
+
+        self._size = size
+        self._n    = 0
+        self._counts: dict[Any, int] = {}
+        self._errors: dict[Any, int] = {}
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def n(self) -> int:
+        return self._n
+
+    @property
+    def counts(self) -> dict[Any, int]:
+        return self._counts
+
+    @property
+    def errors(self) -> dict[Any, int]:
+        return self._errors
+
+    def update(self, counts: Mapping[Any, int]) -> 'HeavyHitterSketch':
+        """
+        Adds exact counts (e.g. of a batch of items)
+        """
+        return self._combine(counts, {}, 0, sum(counts.values()))
+
+    def merge(self, other: 'HeavyHitterSketch') -> 'HeavyHitterSketch':
+        """
+        Adds the counts of another sketch (in place)
+        """
+        return self._combine(other._counts, other._errors, other._floor(), other._n)
+
+    def most_common(self, n: int | None = None) -> list[tuple[Any, int]]:
+        return heapq.nlargest(len(self._counts) if n is None else n, self._counts.items(), key = lambda x: x[1])
+
+    def _floor(self) -> int:
+        # Upper bound of the count of the items that were dropped
+        return min(self._counts.values()) if len(self._counts) >= self._size else 0
+
+    def _combine(self, 
+                 counts: Mapping[Any, int], 
+                 errors: Mapping[Any, int], 
+                 floor:  int, 
+                 n:      int) -> 'HeavyHitterSketch':
+
+        # Items missing from one side are counted at that side's floor
+        own    = self._floor()
+        items  = list(dict.fromkeys([*self._counts, *counts]))
+        merged = {x: self._counts.get(x, own) + counts.get(x, floor) for x in items}
+
+        if len(merged) > self._size:
+            merged = dict(heapq.nlargest(self._size, merged.items(), key = lambda x: x[1]))
+
+        self._errors = {x: self._errors.get(x, own) + errors.get(x, floor) for x in merged}
+        self._counts = merged
+        self._n     += n
+
+        return self
@@ -1,6 +1,9 @@
 __all__ = ["BinaryClassifierConfig", "BinaryClassifier"]
 
+import numpy as np
 from dataclasses import asdict, dataclass
+from scipy import sparse
+from scipy.sparse import csr_matrix, spmatrix
 from typing import Any, TypeVar, override
 
 from ...interface import IConfig, IDataset, IPredictor
@@ -20,6 +23,8 @@ class BinaryClassifierConfig(IConfig):
 
     classification_threshold: float = 0.5
 
+    dtype: str = "float64" # float type of the features and probabilities ("float32" halves their memory)
+
     @override
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -79,17 +84,30 @@ class BinaryClassifier(IPredictor[BinaryClassifierConfig]):
                                                              description = "Predicted binary class")}
 
     # Predictor
-    def _get_regressors(self, data: IDataset) -> tuple[list[int], list[list[float]]]:
+    def _get_regressors(self, data: IDataset) -> tuple[list[int], np.ndarray | spmatrix]:
         cfg = self._config
 
         target = data.get_field_values(cfg.input_field)
-        extras = cfg.additional_regressor_fields or []
-        regressors = []
-        for field in list(data.fields.keys()):
-            if field.startswith(cfg.embedding_prefix) or field in extras:
-                regressors.append(data.get_field_values(field))
+        extras = [x for x in cfg.additional_regressor_fields or [] if not x.startswith(cfg.embedding_prefix)]
+        X      = data.get_matrix_field(cfg.embedding_prefix)
+        X      = csr_matrix(X, dtype = cfg.dtype) if isinstance(X, csr_matrix) else X.astype(cfg.dtype, copy = False)
+
+        if extras:
+            X_extras = np.asarray([data.get_field_values(x) for x in extras], dtype = cfg.dtype).T
+
+            if isinstance(X, csr_matrix):
+                X = csr_matrix(sparse.hstack([X, X_extras], format = "csr"))
+            else:
+                X = np.hstack([X, X_extras])
+
+        return target, X
+
+    def _set_predictions(self, data: IDataset, y_probs: np.ndarray) -> None:
+        y_probs = np.asarray(y_probs, dtype = self._config.dtype)
+        y_class = (y_probs >= self._config.classification_threshold).astype(int)
 
-        return target, regressors
+        data.set_field_values(self._config.output_prob_field,  y_probs)
+        data.set_field_values(self._config.output_class_field, y_class)
 
     @property
     @override
@@ -34,10 +34,9 @@ class LogisticRegression(BinaryClassifier):
         if self.is_trained:
             return
 
-        target, regressors = self._get_regressors(data.train_data)
+        target, X = self._get_regressors(data.train_data)
 
         y = np.asarray(target)
-        X = np.asarray(regressors).T
 
         assert y.shape[0] == X.shape[0], "Invalid X,y shapes"
 
@@ -50,15 +49,9 @@ class LogisticRegression(BinaryClassifier):
 
         data = data.copy()
 
-        _, regressors = self._get_regressors(data)
+        _, X = self._get_regressors(data)
 
-        X = np.asarray(regressors).T
-
-        y_probs = [x[1] for x in self._model.predict_proba(X)]
-        y_class = [int(x >= self._config.classification_threshold) for x in y_probs]
-
-        data.set_field_values(self._config.output_prob_field,  y_probs)
-        data.set_field_values(self._config.output_class_field, y_class)
+        self._set_predictions(data, self._model.predict_proba(X)[:, 1])
 
         return data
 
@@ -3,7 +3,7 @@ __all__ = ["NaiveBayesConfig", "NaiveBayes"]
 import numpy as np
 from dataclasses import dataclass
 from typing import override
-from sklearn.naive_bayes import GaussianNB
+from sklearn.naive_bayes import GaussianNB, MultinomialNB
 
 from ...interface import IDataset
 from .classifier import *
@@ -11,7 +11,8 @@ from .classifier import *
 
 @dataclass
 class NaiveBayesConfig(BinaryClassifierConfig):
-    pass
+
+    variant: str = "gaussian" # "gaussian" or "multinomial" (non-negative features, e.g. sparse TF-IDF)
 
 class NaiveBayes(BinaryClassifier):
     
@@ -21,7 +22,7 @@ class NaiveBayes(BinaryClassifier):
         self._name       = "Naive Bayes"
         self._config     = config or self.get_default_config()
 
-        self._model      = GaussianNB()
+        self._model      = None
         self._is_trained = False
 
     @override
@@ -29,31 +30,34 @@ class NaiveBayes(BinaryClassifier):
         return NaiveBayesConfig()
 
     # Predictor
+    def _get_model(self) -> GaussianNB | MultinomialNB:
+        # Built on training, as the step may be reconfigured after its construction
+        if self._config.variant == "gaussian":
+            return GaussianNB()
+        elif self._config.variant == "multinomial":
+            return MultinomialNB()
+        else:
+            raise Exception(f"Unknown Naive Bayes variant '{self._config.variant}'")
+
     @override
     def train(self, data: IDataset) -> None:
-        target, regressors = self._get_regressors(data.train_data)
+        target, X = self._get_regressors(data.train_data)
 
         y = np.asarray(target)
-        X = np.asarray(regressors).T
 
+        self._model = self._get_model()
         self._model.fit(X, y)
         self._is_trained = True
 
     @override
     def predict(self, data: IDataset) -> IDataset:
-        assert self._is_trained, "Model is has not been trained"
+        assert self._is_trained and self._model is not None, "Model is has not been trained"
 
         data = data.copy()
 
-        _, regressors = self._get_regressors(data)
-
-        X = np.asarray(regressors).T
-
-        y_probs = [float(x) for x in self._model.predict(X)]
-        y_class = [int(x >= self._config.classification_threshold) for x in y_probs]
+        _, X = self._get_regressors(data)
 
-        data.set_field_values(self._config.output_prob_field,  y_probs)
-        data.set_field_values(self._config.output_class_field, y_class)
+        self._set_predictions(data, self._model.predict_proba(X)[:, 1])
 
         return data
 
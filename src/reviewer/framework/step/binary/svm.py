@@ -1,6 +1,7 @@
 __all__ = ["SVMConfig", "SVM"]
 
 import numpy as np
+from scipy import sparse
 from typing import override
 from dataclasses import dataclass
 from sklearn.svm import SVC
@@ -33,10 +34,12 @@ class SVM(BinaryClassifier):
     # Predictor
     @override
     def train(self, data: IDataset) -> None:
-        target, regressors = self._get_regressors(data.train_data)
+        target, X = self._get_regressors(data.train_data)
 
         y = np.asarray(target)
-        X = np.asarray(regressors).T
+
+        # Sparse features (e.g. TF-IDF) are scaled without centering, which would densify them
+        self._model.set_params(standardscaler__with_mean = not sparse.issparse(X))
 
         self._model.fit(X, y)
         self._is_trained = True
@@ -47,15 +50,9 @@ class SVM(BinaryClassifier):
 
         data = data.copy()
 
-        _, regressors = self._get_regressors(data)
-
-        X = np.asarray(regressors).T
-
-        y_probs = [x[1] for x in self._model.predict_proba(X)]
-        y_class = [int(x >= self._config.classification_threshold) for x in y_probs]
+        _, X = self._get_regressors(data)
 
-        data.set_field_values(self._config.output_prob_field,  y_probs)
-        data.set_field_values(self._config.output_class_field, y_class)
+        self._set_predictions(data, self._model.predict_proba(X)[:, 1])
 
         return data
 
@@ -1,9 +1,16 @@
 __all__ = ["CollaborativeFilteringConfig", "CollaborativeFiltering"]
 
+import os
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from pandas import DataFrame
+from scipy.sparse import csr_matrix
 from surprise import SVD, Reader
 from surprise.model_selection import GridSearchCV
 from surprise import Dataset as SDataset
+from surprise import Trainset
 from dataclasses import asdict, dataclass
 from typing import Any, override
 
@@ -24,6 +31,8 @@ class CollaborativeFilteringConfig(IConfig):
     output_field_prefix: str = "recommendation"
     max_recommendations: int = 5
 
+    n_jobs: int = 1
+
     @override
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -105,29 +114,140 @@ class CollaborativeFiltering(IPredictor[CollaborativeFilteringConfig]):
 
         data = data.copy()
 
-        users = data.get_field_values(self._config.user_field)
-
         df = self._get_usermatrix(data)
 
-        # Unique users and products
-        uusers    = df["user"].drop_duplicates().to_list()
-        uproducts = set(df["item"].drop_duplicates().to_list())
+        # Unique users and (sorted) products, and the products each user already rated
+        ucodes, uusers = pd.factorize(df["user"].to_numpy())
+        uproducts      = np.unique(df["item"].to_numpy())
+        icodes         = np.searchsorted(uproducts, df["item"].to_numpy())
+
+        seen = csr_matrix((np.ones(len(df), dtype = bool), (ucodes, icodes)), 
+                          shape = (len(uusers), len(uproducts)))
+
+        factors = self._get_factors(uusers.tolist(), uproducts.tolist())
+
+        # Users are scored in chunks of bounded size
+        size   = max(1, _MAX_SCORES // max(len(uproducts), 1))
+        chunks = [(i, seen[i:i + size]) for i in range(0, len(uusers), size)]
+        n_jobs = self._config.n_jobs if self._config.n_jobs > 0 else (os.cpu_count() or 1)
 
-        # Predict recommendations
-        user_recommendations = {}
-        mr = self._config.max_recommendations
-        for user in uusers:
-            candidates  = sorted(list(uproducts - set(df.query(f"user == {user}")["item"])))
-            predictions = [self._model.predict(user, p) for p in candidates]
-            top_items   = (sorted(predictions, key=lambda x: x.est, reverse=True) + [None] * mr)[:mr]
+        if n_jobs == 1 or len(chunks) <= 1:
+            top = [_recommend_chunk(chunk, factors) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers = min(n_jobs, len(chunks)), 
+                                     mp_context  = multiprocessing.get_context("spawn"),
+                                     initializer = _set_factors,
+                                     initargs    = (factors,)) as pool:
+                top = list(pool.map(_recommend_chunk, chunks))
 
-            user_recommendations[user] = [int(x.iid) if x is not None else 0 for x in top_items]
+        top = np.concatenate(top) if top else np.zeros((0, self._config.max_recommendations), dtype = np.int64)
+
+        # Product ids (0 if there are not enough candidates), mapped back to the rows
+        recommendations = np.where(top >= 0, uproducts[np.maximum(top, 0)], 0)[ucodes]
 
-        # Map recommendations
         for i in range(self._config.max_recommendations):
-            rname   = self._config.output_field_prefix + str(i+1)
-            rvalues = [user_recommendations[u][i] for u in users]
+            rname = self._config.output_field_prefix + str(i+1)
 
-            data.set_field_values(rname, rvalues)
+            data.set_field_values(rname, recommendations[:, i].astype(int))
 
         return data
+
+    def _get_factors(self, users: list[Any], products: list[Any]) -> '_Factors':
+        """
+        Gathers the SVD biases and factors of the users and products (zero
+        for the ones unknown to the model, as by `SVD.estimate`)
+        """
+
+        trainset: Trainset = self._model.trainset
+
+        def inner_ids(raw_ids: list[Any], to_inner: Any) -> np.ndarray:
+            ids = []
+            for raw_id in raw_ids:
+                try:
+                    ids.append(to_inner(raw_id))
+                except ValueError:
+                    ids.append(-1)
+
+            return np.array(ids, dtype = np.int64)
+
+        uids = inner_ids(users,    trainset.to_inner_uid)
+        iids = inner_ids(products, trainset.to_inner_iid)
+
+        def gather(values: np.ndarray, ids: np.ndarray) -> np.ndarray:
+            result = np.zeros((len(ids),) + values.shape[1:], dtype = values.dtype)
+            result[ids >= 0] = values[ids[ids >= 0]]
+            return result
+
+        # Ratings are shifted by an offset by some versions of surprise (if the scale includes values <= 0)
+        offset = float(getattr(trainset, "offset", 0))
+        min_rating, max_rating = trainset.rating_scale
+
+        return _Factors(global_mean = float(trainset.global_mean) - offset,
+                        user_bias   = gather(np.asarray(self._model.bu), uids),
+                        user_vecs   = gather(np.asarray(self._model.pu), uids),
+                        item_bias   = gather(np.asarray(self._model.bi), iids),
+                        item_vecs   = gather(np.asarray(self._model.qi), iids),
+                        min_rating  = float(min_rating),
+                        max_rating  = float(max_rating),
+                        k           = self._config.max_recommendations)
+
+
+# Maximum number of (user, product) scores computed at once
+_MAX_SCORES = 2**24
+
+
+@dataclass
+class _Factors:
+    global_mean: float
+    user_bias:   np.ndarray
+    user_vecs:   np.ndarray
+    item_bias:   np.ndarray
+    item_vecs:   np.ndarray
+    min_rating:  float
+    max_rating:  float
+    k:           int
+
+
+_factors: _Factors | None = None
+
+def _set_factors(factors: _Factors) -> None:
+    global _factors
+    _factors = factors
+
+def _recommend_chunk(chunk: tuple[int, csr_matrix], factors: _Factors | None = None) -> np.ndarray:
+    """
+    Returns the indices of the top-k products (-1 if there are not enough
+    candidates) of a chunk of users, starting at the given user index
+    """
+
+    start, seen = chunk
+    f = factors or _factors
+    assert f is not None, "Factors have not been set"
+
+    users = slice(start, start + seen.get_shape()[0])
+
+    # Estimated ratings (as by `SVD.predict`, clipped to the rating scale), without the rated products
+    scores  = f.global_mean + f.user_bias[users, None] + f.item_bias[None, :] + f.user_vecs[users] @ f.item_vecs.T
+    scores  = np.clip(scores, f.min_rating, f.max_rating)
+    scores[seen.nonzero()] = -np.inf
+
+    n_users, n_items = scores.shape
+    k    = min(f.k, n_items)
+    rows = np.arange(n_users)[:, None]
+    top  = np.full((n_users, f.k), -1, dtype = np.int64)
+    if k == 0:
+        return top
+
+    # The k-th best score, and the products above it plus the first ties (lowest product ids)
+    kth   = -np.partition(-scores, k - 1, axis = 1)[:, k - 1]
+    above = scores > kth[:, None]
+    ties  = scores == kth[:, None]
+    ties &= np.cumsum(ties, axis = 1) <= k - above.sum(axis = 1, keepdims = True)
+
+    # Selected products (in id order), sorted by descending score
+    selected = np.argsort(~(above | ties), axis = 1, kind = "stable")[:, :k]
+    selected = selected[rows, np.argsort(-scores[rows, selected], axis = 1, kind = "stable")]
+
+    top[:, :k] = np.where(np.isfinite(scores[rows, selected]), selected, -1)
+
+    return top
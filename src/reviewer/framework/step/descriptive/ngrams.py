@@ -1,13 +1,16 @@
 __all__ = ["NgramAnalyserConfig", "NgramAnalyser"]
 
-from string import punctuation
-from nltk import word_tokenize
-from collections import Counter
 from dataclasses import asdict, dataclass
 from typing import Any, Callable, override
 
-from ...interface import IConfig, IDataset, IAnalyser
-from ...aliases import AnalysisField, FieldSchema, ResultType, Result, NamedResults
+from ...interface import IConfig, IDataset, IPartialAnalyser
+from ...aliases import AnalysisField, FieldSchema, Tokens, ResultType, Result, NamedResults
+from ...ngram import NgramCounts, count_ngrams, merge_ngram_counts
+from ...sketch import HeavyHitterSketch
+
+
+# Number of texts counted exactly before being added to a sketch
+_SKETCH_BATCH = 10_000
 
 
 @dataclass
@@ -17,13 +20,14 @@ class NgramAnalyserConfig(IConfig):
     output_name: str = "ngrams"
     ngram_range: tuple[int, int] = (1, 1)
     max_ngrams:  int = 50
+    sketch_size: int = 0 # if positive, n-grams are counted approximately by a sketch of this size
 
     @override
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
 
 
-class NgramAnalyser(IAnalyser[NgramAnalyserConfig]):
+class NgramAnalyser(IPartialAnalyser[NgramAnalyserConfig]):
 
     def __init__(self, 
                  config:  NgramAnalyserConfig | None = None) -> None:
@@ -47,8 +51,8 @@ class NgramAnalyser(IAnalyser[NgramAnalyserConfig]):
     # Method
     @override
     def get_required_fields(self) -> dict[AnalysisField, FieldSchema]:
-        return {self._config.input_field: FieldSchema(dtype = str, 
-                                                      description = "Text field to be analysed")}
+        return {self._config.input_field: FieldSchema(dtype = str | Tokens, 
+                                                      description = "Text (or tokens) field to be analysed")}
 
     @override
     def get_created_fields(self) -> dict[AnalysisField, FieldSchema]:
@@ -63,38 +67,44 @@ class NgramAnalyser(IAnalyser[NgramAnalyserConfig]):
     def get_created_results(self) -> dict[str, ResultType]:
         return {self._config.output_name: ResultType.DATASET}
 
-    # Descriptive Analysis 
+    # Partial Analysis
     @override
-    def analyse(self, 
-                data:        IDataset, 
-                results:     NamedResults,
-                new_dataset: Callable[[dict[str, list[Any]]], IDataset]) -> list[Result]:
-
+    def partial(self, data: IDataset) -> NgramCounts:
         texts = data.get_field_values(self._config.input_field)
 
-        ngram_range = self._config.ngram_range
-        punctuation_words = {x for x in punctuation}
+        if self._config.sketch_size <= 0:
+            return count_ngrams(texts, self._config.ngram_range)[None]
+
+        # Texts are counted in batches, so that memory stays bounded
+        sketch = HeavyHitterSketch(self._config.sketch_size)
+        for i in range(0, len(texts), _SKETCH_BATCH):
+            sketch.update(count_ngrams(texts[i:i + _SKETCH_BATCH], self._config.ngram_range)[None])
+
+        return sketch
 
-        counter = Counter() 
-        for text in texts:
-            words = word_tokenize(text)
+    @override
+    def merge(self, 
+              a: NgramCounts, 
+              b: NgramCounts) -> NgramCounts:
+
+        return merge_ngram_counts(a, b)
 
-            for i in range(len(words)):
-                for n in range(ngram_range[0]-1, ngram_range[1]):
-                    if i >= n:
-                        phrase_words = words[i-n:i+1]
-                        if set(phrase_words) & punctuation_words:
-                            continue
+    @override
+    def finalize(self, 
+                 state: NgramCounts, 
+                 new_dataset: Callable[[dict[str, list[Any]]], IDataset]) -> list[Result]:
 
-                        phrase = " ".join(phrase_words)
-                        counter.update([phrase])
+        ngrams  = {k:v for (k,v) in state.most_common(self._config.max_ngrams)}
+        columns = {"ngram":     list(ngrams.keys()),
+                   "frequency": list(ngrams.values())}
 
-        ngrams = {k:v for (k,v) in counter.most_common(self._config.max_ngrams)}
-        result = new_dataset({"ngram":     list(ngrams.keys()),
-                              "frequency": list(ngrams.values())})
+        # Approximate frequencies are upper bounds, overestimated by at most the error
+        if isinstance(state, HeavyHitterSketch):
+            columns["error"] = [state.errors[k] for k in ngrams]
+
+        result = new_dataset(columns)
 
         return [Result(method_id   = self.id, 
                        result_name = self._config.output_name,
                        result_type = ResultType.DATASET,
                        value       = result)]
-
@@ -1,12 +1,11 @@
 __all__ = ["RatingAnalyserConfig", "RatingAnalyser"]
 
-import numpy as np
-from collections import Counter
 from dataclasses import asdict, dataclass, field
 from typing import Callable, Any, override
 
-from ...interface import IConfig, IDataset, IAnalyser
+from ...interface import IConfig, IDataset, IPartialAnalyser
 from ...aliases import AnalysisField, FieldSchema, ResultType, Result, NamedResults
+from ...sketch import QuantileSketch
 
 
 @dataclass
@@ -25,7 +24,7 @@ class RatingAnalyserConfig(IConfig):
         return asdict(self)
 
 
-class RatingAnalyser(IAnalyser[RatingAnalyserConfig]):
+class RatingAnalyser(IPartialAnalyser[RatingAnalyserConfig]):
 
     def __init__(self, 
                  config:  RatingAnalyserConfig | None = None) -> None:
@@ -66,20 +65,27 @@ class RatingAnalyser(IAnalyser[RatingAnalyserConfig]):
         return {self._config.output_histogram_name: ResultType.DATASET,
                 self._config.output_quantile_name:  ResultType.DATASET}
 
-    # Descriptive Analysis 
+    # Partial Analysis
     @override
-    def analyse(self, 
-                data: IDataset, 
-                results: NamedResults,
-                new_dataset: Callable[[dict[str, list[Any]]], IDataset]) -> list[Result]:
-
+    def partial(self, data: IDataset) -> QuantileSketch:
         ratings = data.get_field_values(self._config.input_field)
         assert all([isinstance(x, int) for x in ratings]), "Not all ratings are numeric"
 
+        return QuantileSketch().update(ratings)
+
+    @override
+    def merge(self, a: QuantileSketch, b: QuantileSketch) -> QuantileSketch:
+        return a.merge(b)
+
+    @override
+    def finalize(self, 
+                 state: QuantileSketch, 
+                 new_dataset: Callable[[dict[str, list[Any]]], IDataset]) -> list[Result]:
+
         new_results: list[Result] = []
 
         # Rating counts
-        counter = [(k,v) for k,v in Counter(ratings).items()]
+        counter = [(k,v) for k,v in state.counts.items()]
         if self._config.fill_rating_gaps:
             rfound = {x[0] for x in counter}
             for i in range(self._config.min_rating, self._config.max_rating+1):
@@ -95,12 +101,11 @@ class RatingAnalyser(IAnalyser[RatingAnalyserConfig]):
                                                              "frequency": [x[1] for x in counter]})))
         
         # Rating quantiles
-        qs = np.quantile(ratings, self._config.quantiles)
+        qs = state.quantiles(self._config.quantiles)
         new_results.append(Result(method_id   = self.id,
                                   result_type = ResultType.DATASET,
                                   result_name = self._config.output_quantile_name,
                                   value       = new_dataset({"quantile": self._config.quantiles,
-                                                             "value":    [float(x) for x in qs]})))
+                                                             "value":    qs})))
 
         return new_results
-
@@ -1 +1,2 @@
 from .tfidfembedder import *
+from .hashingembedder import *
@@ -0,0 +1,169 @@
+__all__ = ["HashingEmbedderConfig", "HashingEmbedder"]
+
+import numpy as np
+from dataclasses import asdict, dataclass
+from scipy.sparse import csr_matrix, vstack
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.decomposition import IncrementalPCA
+from sklearn.preprocessing import normalize
+from typing import Any, Iterator, override
+
+from ...interface import IEmbedder, IConfig, IDataset
+from ...unique import UniqueValues
+from ...aliases import AnalysisField, FieldSchema, Tokens
+from .tfidfembedder import _get_tokens
+
+
+@dataclass
+class HashingEmbedderConfig(IConfig):
+
+    input_field:   str = "text"
+    output_prefix: str = "emb_"
+    ngram_range:   tuple[int, int] = (1, 1)
+
+    n_features:         int  = 4096
+    use_svd:            bool = True
+    max_svd_components: int  = 128
+
+    chunk_size: int = 2000
+
+    dtype: str = "float64" # float type of the embeddings ("float32" halves their memory)
+
+    @override
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class HashingEmbedder(IEmbedder[HashingEmbedderConfig]):
+    """
+    TF-IDF embedder without a vocabulary: terms are hashed into n_features
+    columns, document frequencies are counted chunk by chunk and the
+    (optional) dimensionality reduction is an incremental PCA. Memory is
+    therefore bounded by the chunk size, and new texts (with words never
+    seen in training) are embedded without refitting.
+    """
+
+    def __init__(self,
+                 config:  HashingEmbedderConfig | None = None) -> None:
+
+        super().__init__(config)
+
+        self._name   = "Hashing-Embedder"
+        self._config = config or self.get_default_config()
+        self._is_trained = False
+
+    # Identifiable
+    @property
+    @override
+    def name(self) -> str:
+        return self._name
+
+    # Configurable
+    @override
+    def get_default_config(self) -> HashingEmbedderConfig:
+        return HashingEmbedderConfig()
+
+    # Method
+    @override
+    def get_required_fields(self) -> dict[AnalysisField, FieldSchema]:
+        return {self._config.input_field: FieldSchema(dtype = str | Tokens,
+                                                      description = "Preprocessed text (or tokens)")}
+
+    @override
+    def get_created_fields(self) -> dict[AnalysisField, FieldSchema]:
+        return {self._config.output_prefix: FieldSchema(dtype = float,
+                                                        prefix = True,
+                                                        description = "Embedding fields")}
+
+    # Embedder
+    @override
+    def train(self, data: IDataset) -> None:
+        if self.is_trained:
+            return
+
+        texts = data.train_data.get_field_values(self._config.input_field)
+
+        # Passed as keywords, as the sklearn stubs type them too narrowly (no callables, None or numpy dtypes)
+        options: dict[str, Any] = {"norm":  None,
+                                   "dtype": np.dtype(self._config.dtype)}
+
+        # Tokenised texts are used as they are (instead of being re-tokenised)
+        if texts and isinstance(texts[0], list):
+            options["analyzer"] = _get_tokens
+        else:
+            options["ngram_range"] = tuple(self._config.ngram_range)
+
+        self._hasher = HashingVectorizer(n_features     = int(self._config.n_features),
+                                         alternate_sign = False,
+                                         **options)
+
+        # First pass: document frequencies (smoothed idf, as by TfidfVectorizer)
+        n_docs = 0
+        dfs    = np.zeros(int(self._config.n_features), dtype = np.int64)
+        for chunk in self._chunks(texts):
+            X = csr_matrix(self._hasher.transform(chunk))
+            X.sum_duplicates()
+
+            n_docs += len(chunk)
+            dfs    += np.bincount(X.indices, minlength = len(dfs))
+
+        self._idf = (np.log((1 + n_docs) / (1 + dfs)) + 1).astype(self._config.dtype)
+
+        # Second pass: the PCA is fitted chunk by chunk (chunks smaller than the number of components are merged)
+        if self._config.use_svd:
+            if n_docs == 0:
+                raise Exception("Cannot train the hashing embedder - no training texts")
+
+            # There cannot be more components than training texts
+            n_components = min(int(self._config.max_svd_components), int(self._config.n_features), n_docs)
+            self._pca    = IncrementalPCA(n_components = n_components)
+
+            for chunk in self._chunks(texts, min_size = n_components):
+                self._pca.partial_fit(self._tfidf(chunk).toarray())
+
+        self._is_trained = True
+
+    @override
+    def embed(self, data: IDataset) -> IDataset:
+        assert self._is_trained, "Embedder has not been trained yet"
+
+        data = data.copy()
+
+        # Each distinct text is embedded once, chunk by chunk
+        unique = UniqueValues(data.get_field_values(self._config.input_field))
+
+        X_transform: np.ndarray | csr_matrix
+
+        if self._config.use_svd:
+            X_transform = np.vstack([self._pca.transform(self._tfidf(chunk).toarray()).astype(self._config.dtype, copy = False) 
+                                     for chunk in self._chunks(unique.values)])
+        else:
+            X_transform = csr_matrix(vstack([self._tfidf(chunk) for chunk in self._chunks(unique.values)], format = "csr"))
+
+        data.set_matrix_field(self._config.output_prefix, unique.broadcast_matrix(X_transform))
+
+        self.note(f"Embedded {unique}")
+
+        return data
+
+    @property
+    @override
+    def is_trained(self) -> bool:
+        return self._is_trained
+
+    def _tfidf(self, texts: list[Any]) -> csr_matrix:
+        return csr_matrix(normalize(csr_matrix(self._hasher.transform(texts)).multiply(self._idf)))
+
+    def _chunks(self, texts: list[Any], min_size: int = 1) -> Iterator[list[Any]]:
+        """
+        Yields chunks of chunk_size texts (the last one is merged into the
+        previous one, if it is smaller than min_size)
+        """
+
+        size   = max(int(self._config.chunk_size), min_size)
+        starts = list(range(0, len(texts), size))
+        if len(starts) > 1 and len(texts) - starts[-1] < min_size:
+            starts.pop()
+
+        for i, start in enumerate(starts):
+            yield texts[start:starts[i + 1] if i + 1 < len(starts) else len(texts)]
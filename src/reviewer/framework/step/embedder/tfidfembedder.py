@@ -2,12 +2,14 @@ __all__ = ["TfIdfEmbedderConfig", "TfIdfEmbedder"]
 
 import numpy as np
 from dataclasses import asdict, dataclass
+from scipy.sparse import csr_matrix
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.decomposition import TruncatedSVD
 from typing import Any, override
 
 from ...interface import IEmbedder, IConfig, IDataset
-from ...aliases import AnalysisField, FieldSchema
+from ...unique import UniqueValues
+from ...aliases import AnalysisField, FieldSchema, Tokens
 
 
 @dataclass
@@ -21,6 +23,13 @@ class TfIdfEmbedderConfig(IConfig):
     use_svd:            bool = True
     max_svd_components: int  = 128
 
+    svd_algorithm:     str = "randomized" # or "arpack"
+    svd_n_iter:        int = 5            # iterations of the randomized solver
+    svd_n_oversamples: int = 10           # oversampling of the randomized solver
+    svd_random_state:  int | None = None
+
+    dtype: str = "float64" # float type of the embeddings ("float32" halves their memory)
+
     @override
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -52,12 +61,12 @@ class TfIdfEmbedder(IEmbedder[TfIdfEmbedderConfig]):
     # Method
     @override
     def get_required_fields(self) -> dict[AnalysisField, FieldSchema]:
-        return {self._config.input_field: FieldSchema(dtype = str, 
-                                                      description = "To be preprocessed text")}
+        return {self._config.input_field: FieldSchema(dtype = str | Tokens, 
+                                                      description = "Preprocessed text (or tokens)")}
 
     @override
     def get_created_fields(self) -> dict[AnalysisField, FieldSchema]:
-        return {self._config.output_prefix: FieldSchema(dtype = str, 
+        return {self._config.output_prefix: FieldSchema(dtype = float, 
                                                         prefix = True,
                                                         description = "Embedding fields")}
 
@@ -67,11 +76,24 @@ class TfIdfEmbedder(IEmbedder[TfIdfEmbedderConfig]):
         if self.is_trained:
             return
 
-        self._tfidf = TfidfVectorizer(max_features = int(self._config.max_features))
-        self._svd   = TruncatedSVD(n_components    = int(self._config.max_svd_components))
-
         texts = data.train_data.get_field_values(self._config.input_field)
 
+        # Passed as keywords, as the sklearn stubs type them too narrowly (no callables or numpy dtypes)
+        options: dict[str, Any] = {"dtype": np.dtype(self._config.dtype)}
+
+        # Tokenised texts are used as they are (instead of being re-tokenised)
+        if texts and isinstance(texts[0], list):
+            options["analyzer"] = _get_tokens
+
+        self._tfidf = TfidfVectorizer(max_features = int(self._config.max_features),
+                                      **options)
+
+        self._svd = TruncatedSVD(n_components  = int(self._config.max_svd_components),
+                                 algorithm     = self._config.svd_algorithm,
+                                 n_iter        = int(self._config.svd_n_iter),
+                                 n_oversamples = int(self._config.svd_n_oversamples),
+                                 random_state  = self._config.svd_random_state)
+
         if not self._is_trained:
             X_tfidf = self._tfidf.fit_transform(texts)
 
@@ -86,19 +108,21 @@ class TfIdfEmbedder(IEmbedder[TfIdfEmbedderConfig]):
 
         data = data.copy()
 
-        texts = data.get_field_values(self._config.input_field)
+        # Each distinct text is embedded once
+        unique = UniqueValues(data.get_field_values(self._config.input_field))
+
+        X_tfidf = csr_matrix(self._tfidf.transform(unique.values))
 
-        X_tfidf = self._tfidf.transform(texts)
+        X_transform: np.ndarray | csr_matrix
 
         if self._config.use_svd:
-            X_transform = self._svd.transform(X_tfidf)
+            X_transform = self._svd.transform(X_tfidf).astype(self._config.dtype, copy = False)
         else:
             X_transform = X_tfidf
 
-        assert isinstance(X_transform, np.ndarray), "Unexpected data type"
+        data.set_matrix_field(self._config.output_prefix, unique.broadcast_matrix(X_transform))
 
-        for i in range(X_transform.shape[1]):
-            data.set_field_values(f"{self._config.output_prefix}{i}", [float(x) for x in X_transform[:,i]])
+        self.note(f"Embedded {unique}")
 
         return data
 
@@ -106,3 +130,7 @@ class TfIdfEmbedder(IEmbedder[TfIdfEmbedderConfig]):
     @override
     def is_trained(self) -> bool:
         return self._is_trained
+
+
+def _get_tokens(tokens: list[str]) -> list[str]:
+    return tokens
@@ -1 +1,2 @@
 from .preprocessor import *
+from .wordcache import *
@@ -1,14 +1,23 @@
 __all__ = ["PreprocessorConfig", "Preprocessor"]
 
+import os
 import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from nltk.corpus import stopwords as nltk_stopwords
 from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer, SnowballStemmer
 from dataclasses import asdict, dataclass
-from typing import Any, override
+from typing import Any, Callable, override
 
-from ...aliases import AnalysisField, FieldSchema
+from ...aliases import AnalysisField, FieldSchema, Tokens
 from ...interface import IConfig, IPreprocessor, IDataset
+from ...unique import UniqueValues
+from .wordcache import WordCache
+
+
+_PUNCTUATION = re.compile(r"([^\w\s]|_)")
 
 
 @dataclass
@@ -22,11 +31,15 @@ class PreprocessorConfig(IConfig):
     do_lowercase:          bool = True
     do_remove_stopwords:   bool = True
     do_remove_short:       bool = True
-    do_remove_nonascii:    bool = True
+    do_remove_nonascii:    bool = True # no effect (it never removed characters), kept for saved workflows
     do_stem:               bool = True
     do_lemmatization:      bool = False
     do_remove_punctuation: bool = False
 
+    output_tokens: bool = False
+
+    n_jobs: int = 1
+
     @override
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -41,7 +54,6 @@ class Preprocessor(IPreprocessor[PreprocessorConfig]):
 
         self._name      = "Preprocessor"
         self._config    = config or self.get_default_config()
-        self._stopwords = set(nltk_stopwords.words(self._config.language))
 
     # Identifiable
     @property
@@ -62,7 +74,15 @@ class Preprocessor(IPreprocessor[PreprocessorConfig]):
 
     @override
     def get_created_fields(self) -> dict[AnalysisField, FieldSchema]:
+        # Tokens would silently retype the (str) input field
+        if self._config.output_tokens and self._config.input_field == self._config.output_field:
+            raise Exception(f"Cannot write tokens to the input field '{self._config.input_field}' (choose another output_field)")
+
         if self._config.input_field != (new_field := self._config.output_field):
+            if self._config.output_tokens:
+                return {new_field: FieldSchema(dtype = Tokens, 
+                                               description = "Preprocessed tokens")}
+
             return {new_field: FieldSchema(dtype = str, 
                                            description = "Preprocessed text")}
         return {}
@@ -74,41 +94,82 @@ class Preprocessor(IPreprocessor[PreprocessorConfig]):
 
         cfg = self._config
 
-        values = data.get_field_values(cfg.input_field)
-    
-        if cfg.do_remove_nonascii:
-            values = [re.sub(r"","",str(x)) for x in values]
+        # Each distinct text is preprocessed once
+        unique = UniqueValues([str(x) for x in data.get_field_values(cfg.input_field)])
+        values = unique.values
 
-        if cfg.do_lowercase:
-            values = [str(x).lower() for x in values]
+        n_jobs = cfg.n_jobs if cfg.n_jobs > 0 else (os.cpu_count() or 1)
 
-        if cfg.do_remove_stopwords:
-            for i, text in enumerate(values):
-                values[i] = " ".join([w for w in word_tokenize(text) if w.lower() not in self._stopwords])
+        if n_jobs == 1 or len(values) < 2 * n_jobs:
+            values = _preprocess_chunk(values, cfg)
+        else:
+            # Chunks are processed in worker processes (and returned in order)
+            size   = -(-len(values) // (4 * n_jobs))
+            chunks = [values[i:i + size] for i in range(0, len(values), size)]
 
-        if cfg.do_stem:
-            stemmer = SnowballStemmer(language=self._config.language)
+            with ProcessPoolExecutor(max_workers = n_jobs, 
+                                     mp_context  = multiprocessing.get_context("spawn"),
+                                     initializer = WordCache.configure,
+                                     initargs    = WordCache.get_config()) as pool:
+                values = [x for chunk in pool.map(_preprocess_chunk, chunks, repeat(cfg)) for x in chunk]
 
-            for i, text in enumerate(values):
-                values[i] = " ".join([stemmer.stem(w) for w in word_tokenize(text)])
+        data.set_field_values(cfg.output_field, unique.broadcast(values))
 
-        if cfg.do_lemmatization:
-            lemmatizer = WordNetLemmatizer()
+        self.note(f"Preprocessed {unique}")
 
-            for i, text in enumerate(values):
-                values[i] = " ".join([lemmatizer.lemmatize(w) for w in word_tokenize(text)])
+        return data
 
-        if cfg.do_remove_punctuation:
-            values = [re.sub(r"([^\w\s]|_)", " ", str(x)) for x in values]
 
-        if cfg.do_remove_short:
-            for i, text in enumerate(values):
-                values[i] = " ".join([x for x in text.split() if len(x) >= 3])
+@lru_cache(maxsize = None)
+def _get_stopwords(language: str) -> set[str]:
+    return set(nltk_stopwords.words(language))
 
-        # Remove double spaces
-        values = [re.sub(r"[ ]{2,}", " ", str(x)).strip() for x in values]
+def _preprocess_chunk(values: list[str], cfg: PreprocessorConfig) -> list[str] | list[list[str]]:
+    """
+    Runs the whole preprocessing pipeline on a chunk of documents
+    """
 
-        data.set_field_values(cfg.output_field, values)
+    stopwords = _get_stopwords(cfg.language)
+    stem      = WordCache.shared("stem",  cfg.language).get if cfg.do_stem          else None
+    lemmatize = WordCache.shared("lemma", cfg.language).get if cfg.do_lemmatization else None
 
-        return data
+    tokens = [_preprocess_text(x, cfg, stopwords, stem, lemmatize) for x in values]
+
+    WordCache.save_all()
+
+    return tokens if cfg.output_tokens else [" ".join(x) for x in tokens]
+
+def _preprocess_text(text:       str,
+                     cfg:        PreprocessorConfig,
+                     stopwords:  set[str],
+                     stem:       Callable[[str], str] | None,
+                     lemmatize:  Callable[[str], str] | None) -> list[str]:
+
+    if cfg.do_lowercase:
+        text = text.lower()
+
+    # The text is tokenised only once (splitting on whitespace suffices, if no word-level filter is enabled)
+    if cfg.do_remove_stopwords or cfg.do_stem or cfg.do_lemmatization or cfg.output_tokens:
+        words = word_tokenize(text)
+    else:
+        words = text.split()
+
+    tokens = []
+    for word in words:
+        if cfg.do_remove_stopwords and word.lower() in stopwords:
+            continue
+
+        if stem:
+            word = stem(word)
+
+        if lemmatize:
+            word = lemmatize(word)
+
+        if cfg.do_remove_punctuation:
+            parts = _PUNCTUATION.sub(" ", word).split()
+        else:
+            parts = [word]
+
+        tokens += [x for x in parts if len(x) >= 3] if cfg.do_remove_short else parts
 
+    return tokens
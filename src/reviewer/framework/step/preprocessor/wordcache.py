@@ -0,0 +1,151 @@
+__all__ = ["WordCache"]
+
+import os
+import uuid
+import pickle
+import threading
+from nltk.stem import WordNetLemmatizer, SnowballStemmer
+from typing import Any, Callable
+
+
+class WordCache:
+    """
+    Bounded memo of word -> normalised word (stem or lemma) for one
+    language. The caches are shared by all the preprocessors of a process
+    (see `WordCache.shared`) and, if a directory is configured, persisted
+    across runs.
+
+    Once a cache is full, new words are no longer memoised. Since review
+    vocabularies are Zipfian, the words seen first are mostly the frequent
+    ones.
+    """
+
+    _caches:    dict[tuple[str, str], 'WordCache'] = {}
+    _lock:      threading.Lock = threading.Lock()
+    _directory: str | None = None
+    _max_size:  int = 100_000
+
+    def __init__(self,
+                 normalise: Callable[[str], str],
+                 max_size:  int = 100_000,
+                 path:      str | None = None) -> None:
+
+        self._normalise = normalise
+        self._max_size  = max_size
+        self._path      = path
+        self._words: dict[str, str] = {}
+
+        self._hits   = 0
+        self._misses = 0
+        self._dirty  = False
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    self._words = dict(list(pickle.load(f).items())[:max_size])
+            except (EOFError, pickle.UnpicklingError):
+                pass
+
+    @classmethod
+    def configure(cls, directory: str | None, max_size: int = 100_000) -> None:
+        """
+        Sets the directory the shared caches are persisted in (None keeps
+        them in memory only) and their maximum number of words. Already
+        created caches are dropped.
+        """
+
+        if directory:
+            os.makedirs(directory, exist_ok = True)
+
+        with cls._lock:
+            cls._directory = directory
+            cls._max_size  = max_size
+            cls._caches    = {}
+
+    @classmethod
+    def get_config(cls) -> tuple[str | None, int]:
+        """
+        Returns the arguments of the active `configure` call
+        """
+        return cls._directory, cls._max_size
+
+    @classmethod
+    def shared(cls, kind: str, language: str) -> 'WordCache':
+        """
+        Returns the shared cache of the given kind ("stem" or "lemma") and
+        language
+        """
+
+        with cls._lock:
+            if (cache := cls._caches.get((kind, language))) is not None:
+                return cache
+
+            if kind == "stem":
+                normalise = SnowballStemmer(language = language).stem
+            elif kind == "lemma":
+                normalise = WordNetLemmatizer().lemmatize
+            else:
+                raise Exception(f"Unknown word cache '{kind}'")
+
+            path  = f"{cls._directory}/{kind}_{language}.pkl" if cls._directory else None
+            cache = cls._caches[(kind, language)] = WordCache(normalise = normalise,
+                                                              max_size  = cls._max_size,
+                                                              path      = path)
+            return cache
+
+    @classmethod
+    def save_all(cls) -> None:
+        """
+        Persists the shared caches that changed (if a directory is configured)
+        """
+
+        with cls._lock:
+            caches = list(cls._caches.values())
+
+        for cache in caches:
+            cache.save()
+
+    @classmethod
+    def get_stats(cls) -> dict[str, dict[str, Any]]:
+        """
+        Returns the hit-rate statistics of the shared caches
+        """
+
+        with cls._lock:
+            return {f"{kind}_{language}": cache.stats for (kind, language), cache in cls._caches.items()}
+
+    def get(self, word: str) -> str:
+        if (value := self._words.get(word)) is not None:
+            self._hits += 1
+            return value
+
+        self._misses += 1
+        value = self._normalise(word)
+
+        if len(self._words) < self._max_size:
+            self._words[word] = value
+            self._dirty = True
+
+        return value
+
+    def save(self) -> None:
+        if not self._path or not self._dirty:
+            return
+
+        self._dirty = False
+
+        # Written atomically, as several processes may share the directory
+        temp = f"{self._path}.{uuid.uuid4().hex}.tmp"
+        with open(temp, "wb") as f:
+            pickle.dump(dict(self._words), f, protocol = pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temp, self._path)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        total = self._hits + self._misses
+
+        return {"size":     len(self._words),
+                "hits":     self._hits,
+                "misses":   self._misses,
+                "hit_rate": self._hits / total if total else 0.0}
@@ -1,13 +1,17 @@
 __all__ = ["TemporalNgramAnalyserConfig", "TemporalNgramAnalyser"]
 
-from string import punctuation
-from nltk import word_tokenize
-from collections import Counter
 from dataclasses import asdict, dataclass
 from typing import Any, Callable, override
 
-from ...interface import IConfig, IDataset, IAnalyser
-from ...aliases import AnalysisField, FieldSchema, ResultType, Result, NamedResults
+from ...interface import IConfig, IDataset, IPartialAnalyser
+from ...aliases import AnalysisField, FieldSchema, Tokens, ResultType, Result, NamedResults
+from ...ngram import NgramCounts, count_ngrams, merge_ngram_counts
+from ...sketch import HeavyHitterSketch
+from ...buckets import bucket_dates, sort_dates
+
+
+# Number of texts counted exactly before being added to the sketches
+_SKETCH_BATCH = 10_000
 
 
 @dataclass
@@ -15,16 +19,19 @@ class TemporalNgramAnalyserConfig(IConfig):
 
     input_field: str  = "text"
     date_field:  str  = "date"
+    date_bucket: str | None = None # "day", "week", "month" or "year" (None: raw date values)
+    date_format: str | None = None # strptime format of the dates (e.g. "%Y%m%d"), None: strings are parsed, numbers are Unix seconds
     output_name: str  = "ngrams"
     ngram_range: tuple[int, int] = (1, 1)
     max_ngrams:  int  = 50
+    sketch_size: int  = 0 # if positive, n-grams are counted approximately by a sketch of this size (per date)
 
     @override
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
 
 
-class TemporalNgramAnalyser(IAnalyser[TemporalNgramAnalyserConfig]):
+class TemporalNgramAnalyser(IPartialAnalyser[TemporalNgramAnalyserConfig]):
 
     def __init__(self, 
                  config:  TemporalNgramAnalyserConfig | None = None) -> None:
@@ -48,8 +55,8 @@ class TemporalNgramAnalyser(IAnalyser[TemporalNgramAnalyserConfig]):
     # Method
     @override
     def get_required_fields(self) -> dict[AnalysisField, FieldSchema]:
-        return {self._config.input_field: FieldSchema(dtype = str, 
-                                                      description = "Text field to be analysed"),
+        return {self._config.input_field: FieldSchema(dtype = str | Tokens, 
+                                                      description = "Text (or tokens) field to be analysed"),
                 self._config.date_field: FieldSchema(dtype = str | int, 
                                                      description = "Date field")}
 
@@ -66,55 +73,66 @@ class TemporalNgramAnalyser(IAnalyser[TemporalNgramAnalyserConfig]):
     def get_created_results(self) -> dict[str, ResultType]:
         return {self._config.output_name: ResultType.DATASET}
 
-    # Descriptive Analysis 
+    # Partial Analysis
     @override
-    def analyse(self, 
-                data:        IDataset, 
-                results:     NamedResults,
-                new_dataset: Callable[[dict[str, list[Any]]], IDataset]) -> list[Result]:
-
+    def partial(self, data: IDataset) -> dict[Any, NgramCounts]:
         texts = data.get_field_values(self._config.input_field)
-        dates = data.get_field_values(self._config.date_field)
+        dates = bucket_dates(data.get_field_values(self._config.date_field), self._config.date_bucket, self._config.date_format)
+
+        if self._config.sketch_size <= 0:
+            return {**count_ngrams(texts, self._config.ngram_range, groups = dates)}
+
+        # Texts are counted in batches, so that memory stays bounded
+        sketches: dict[Any, HeavyHitterSketch] = {}
+        for i in range(0, len(texts), _SKETCH_BATCH):
+            counters = count_ngrams(texts[i:i + _SKETCH_BATCH], self._config.ngram_range, groups = dates[i:i + _SKETCH_BATCH])
+
+            for date, counter in counters.items():
+                sketches.setdefault(date, HeavyHitterSketch(self._config.sketch_size)).update(counter)
 
-        ngram_range = self._config.ngram_range
-        punctuation_words = {x for x in punctuation}
-        counters = {}
+        return {**sketches}
 
-        for date, text in zip(dates, texts):
-            if date not in counters:
-                counters[date] = Counter()
-        
-            counter = counters[date]
-            words = word_tokenize(text)
+    @override
+    def merge(self, 
+              a: dict[Any, NgramCounts], 
+              b: dict[Any, NgramCounts]) -> dict[Any, NgramCounts]:
+
+        for date, counter in b.items():
+            a[date] = merge_ngram_counts(a[date], counter) if date in a else counter
 
-            for i in range(len(words)):
-                for n in range(ngram_range[0]-1, ngram_range[1]):
-                    if i >= n:
-                        phrase_words = words[i-n:i+1]
-                        if set(phrase_words) & punctuation_words:
-                            continue
+        return a
 
-                        phrase = " ".join(phrase_words)
-                        counter.update([phrase])
+    @override
+    def finalize(self, 
+                 state: dict[Any, NgramCounts], 
+                 new_dataset: Callable[[dict[str, list[Any]]], IDataset]) -> list[Result]:
 
         c_dates  = []
         c_ngrams = []
         c_freqs  = []
-        for date in sorted(list(set(dates))):
-            counter = counters[date]
+        c_errors = []
+        for date in sort_dates(state):
+            counter = state[date]
             ngrams  = {k:v for (k,v) in counter.most_common(self._config.max_ngrams)}
 
             c_dates  += [date] * len(ngrams)
             c_ngrams += list(ngrams.keys())
             c_freqs  += list(ngrams.values())
 
+            # Approximate frequencies are upper bounds, overestimated by at most the error
+            if isinstance(counter, HeavyHitterSketch):
+                c_errors += [counter.errors[k] for k in ngrams]
 
-        result = new_dataset({"date":      c_dates,
-                              "ngram":     c_ngrams,
-                              "frequency": c_freqs})
+        columns = {"date":      c_dates,
+                   "ngram":     c_ngrams,
+                   "frequency": c_freqs}
+
+        if self._config.sketch_size > 0:
+            columns["error"] = c_errors
+
+        result = new_dataset(columns)
 
         return [Result(method_id   = self.id, 
                        result_name = self._config.output_name,
                        result_type = ResultType.DATASET,
                        value       = result)]
-
@@ -1,12 +1,15 @@
 __all__ = ["TemporalRatingAnalyserConfig", "TemporalRatingAnalyser"]
 
 import numpy as np
+import pandas as pd
 from collections import Counter
 from dataclasses import asdict, dataclass, field
 from typing import Callable, Any, override
 
-from ...interface import IConfig, IDataset, IAnalyser
+from ...interface import IConfig, IDataset, IPartialAnalyser
 from ...aliases import AnalysisField, FieldSchema, ResultType, Result, NamedResults
+from ...sketch import QuantileSketch
+from ...buckets import bucket_dates, sort_dates
 
 
 @dataclass
@@ -14,6 +17,8 @@ class TemporalRatingAnalyserConfig(IConfig):
 
     input_field:           str = "rating"
     date_field:            str = "date"
+    date_bucket:           str | None = None # "day", "week", "month" or "year" (None: raw date values)
+    date_format:           str | None = None # strptime format of the dates (e.g. "%Y%m%d"), None: strings are parsed, numbers are Unix seconds
     output_histogram_name: str = "rating_histogram"
     output_quantile_name:  str = "rating_quantiles"
     quantiles:             list[float] = field(default_factory = lambda: [0.05, 0.25, 0.50, 0.75, 0.95]) 
@@ -26,7 +31,7 @@ class TemporalRatingAnalyserConfig(IConfig):
         return asdict(self)
 
 
-class TemporalRatingAnalyser(IAnalyser[TemporalRatingAnalyserConfig]):
+class TemporalRatingAnalyser(IPartialAnalyser[TemporalRatingAnalyserConfig]):
 
     def __init__(self, 
                  config:  TemporalRatingAnalyserConfig | None = None) -> None:
@@ -70,33 +75,53 @@ class TemporalRatingAnalyser(IAnalyser[TemporalRatingAnalyserConfig]):
         return {self._config.output_histogram_name: ResultType.DATASET,
                 self._config.output_quantile_name:  ResultType.DATASET}
 
-    # Descriptive Analysis 
+    # Partial Analysis
     @override
-    def analyse(self, 
-                data: IDataset, 
-                results: NamedResults,
-                new_dataset: Callable[[dict[str, list[Any]]], IDataset]) -> list[Result]:
+    def partial(self, data: IDataset) -> dict[Any, QuantileSketch]:
+        ratings = np.asarray(data.get_field_values(self._config.input_field))
+        dates   = bucket_dates(data.get_field_values(self._config.date_field), self._config.date_bucket, self._config.date_format)
+        if len(ratings) == 0:
+            return {}
 
-        ratings = data.get_field_values(self._config.input_field)
-        dates   = data.get_field_values(self._config.date_field)
-        assert all([isinstance(x, int) for x in ratings]), "Not all ratings are numeric"
+        assert np.issubdtype(ratings.dtype, np.integer), "Not all ratings are numeric"
 
-        new_results: list[Result] = []
+        # Rating counts per date, as a (dates x ratings) table
+        codes, uniques = pd.factorize(pd.Series(dates, dtype = object), use_na_sentinel = False)
+        low    = int(ratings.min())
+        span   = int(ratings.max()) - low + 1
+        counts = np.bincount(codes * span + (ratings - low), minlength = len(uniques) * span).reshape(-1, span)
+
+        sketches = {}
+        for date, row in zip(uniques, counts.tolist()):
+            sketches[date] = QuantileSketch(Counter({low + r: n for r, n in enumerate(row) if n}))
+
+        return sketches
 
-        # Partition per date
-        date_ratings = {}
-        for date, rating in zip(dates, ratings):
-            if date not in date_ratings:
-                date_ratings[date] = []
+    @override
+    def merge(self, 
+              a: dict[Any, QuantileSketch], 
+              b: dict[Any, QuantileSketch]) -> dict[Any, QuantileSketch]:
+
+        merged = dict(a)
+        for date, sketch in b.items():
+            merged[date] = merged[date].merge(sketch) if date in merged else sketch
 
-            date_ratings[date].append(rating)
+        return merged
+
+    @override
+    def finalize(self, 
+                 state: dict[Any, QuantileSketch], 
+                 new_dataset: Callable[[dict[str, list[Any]]], IDataset]) -> list[Result]:
+
+        new_results: list[Result] = []
 
         # Rating counts
         c_dates   = []
         c_ratings = []
         c_freqs   = []
-        for date, dratings in date_ratings.items():
-            counter = [(k,v) for k,v in Counter(dratings).items()]
+        for date in sort_dates(state):
+            sketch  = state[date]
+            counter = [(k,v) for k,v in sketch.counts.items()]
             if self._config.fill_rating_gaps:
                 rfound = {x[0] for x in counter}
                 for i in range(self._config.min_rating, self._config.max_rating+1):
@@ -116,23 +141,22 @@ class TemporalRatingAnalyser(IAnalyser[TemporalRatingAnalyserConfig]):
                                                              "rating":    c_ratings,
                                                              "frequency": c_freqs})))
         
-        # Rating quantiles
+        # Rating quantiles (per date)
         c_dates     = []
         c_quantiles = []
         c_values    = []
-        for date, dratings in date_ratings.items():
-            qs = np.quantile(ratings, self._config.quantiles)
+        for date in sort_dates(state):
+            qs = state[date].quantiles(self._config.quantiles)
 
             c_dates     += [date] * len(qs)
             c_quantiles += self._config.quantiles
-            c_values    += [float(x) for x in qs]
+            c_values    += qs
 
         new_results.append(Result(method_id   = self.id,
                                   result_type = ResultType.DATASET,
-                                  result_name = self._config.output_histogram_name,
+                                  result_name = self._config.output_quantile_name,
                                   value       = new_dataset({"date":     c_dates,
                                                              "quantile": c_quantiles,
                                                              "value":    c_values})))
 
         return new_results
-
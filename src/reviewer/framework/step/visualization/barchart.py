@@ -3,7 +3,7 @@ __all__ = ["BarChartConfig", "BarChart"]
 from matplotlib.colors import Colormap
 from matplotlib.ticker import FormatStrFormatter
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure as PltFigure
 from dataclasses import asdict, dataclass
 from typing import Any, Generator, override, Callable
 
@@ -137,7 +137,8 @@ class BarChart(IVisualizer[BarChartConfig]):
         x_tick_labels = [cfg.category_tick_format % xi for xi in x ]
         y_tick_labels = [cfg.target_tick_format % yi for yi in y ]
         
-        fig, ax = plt.subplots(figsize=(10, 5))
+        fig = PltFigure(figsize=(10, 5))
+        ax  = fig.subplots()
         ax.bar(x, y, color=colors)
 
         ax.set_title(f"{cfg.title}")
@@ -152,7 +153,6 @@ class BarChart(IVisualizer[BarChartConfig]):
             ax.yaxis.set_major_formatter(FormatStrFormatter(cfg.target_tick_format))
 
         ax.spines[['right', 'top']].set_visible(False)
-        plt.close(fig)
 
         return [Result(method_id   = self.id,
                        result_name = self._config.output_name,
@@ -3,7 +3,7 @@ __all__ = ["LinePlotConfig", "LinePlot"]
 from matplotlib.colors import Colormap
 from matplotlib.ticker import FormatStrFormatter
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure as PltFigure
 from dataclasses import asdict, dataclass
 from typing import Any, Generator, override, Callable
 
@@ -135,7 +135,8 @@ class LinePlot(IVisualizer[LinePlotConfig]):
 
         marker = cfg.marker if cfg.marker == "" or cfg.marker in self._markers else self._markers[0]
 
-        fig, ax = plt.subplots(figsize=(10, 5))
+        fig = PltFigure(figsize=(10, 5))
+        ax  = fig.subplots()
         ax.plot(x, y, c=color)
         if marker:
             ax.scatter(x, y, marker=marker, c=color)
@@ -148,7 +149,6 @@ class LinePlot(IVisualizer[LinePlotConfig]):
         ax.yaxis.set_major_formatter(FormatStrFormatter(cfg.y_tick_format))
 
         ax.spines[['right', 'top']].set_visible(False)
-        plt.close(fig)
 
         return [Result(method_id   = self.id,
                        result_name = self._config.output_name,
@@ -1,7 +1,7 @@
 __all__ = ["ScatterPlotConfig", "ScatterPlot"]
 
 from matplotlib.colors import Colormap
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure as PltFigure
 from dataclasses import asdict, dataclass
 from typing import Any, Generator, override, Callable
 
@@ -131,7 +131,8 @@ class ScatterPlot(IVisualizer[ScatterPlotConfig]):
 
         marker = cfg.marker if cfg.marker in self._markers else self._markers[0]
 
-        fig, ax = plt.subplots(figsize=(10, 5))
+        fig = PltFigure(figsize=(10, 5))
+        ax  = fig.subplots()
         ax.scatter(x, y, marker=marker, c=colors)
         ax.set_title(f"{cfg.title}")
         ax.set_xlabel(cfg.x_label)
@@ -141,7 +142,6 @@ class ScatterPlot(IVisualizer[ScatterPlotConfig]):
         ax.yaxis.set_major_formatter(FormatStrFormatter(cfg.y_tick_format))
 
         ax.spines[['right', 'top']].set_visible(False)
-        plt.close(fig)
 
         return [Result(method_id   = self.id,
                        result_name = self._config.output_name,
@@ -1,8 +1,8 @@
 __all__ = ["TSneVisualizationConfig", "TSneVisualization"]
 
 from matplotlib.colors import Colormap
-import numpy as np
-import matplotlib.pyplot as plt
+from scipy import sparse
+from matplotlib.figure import Figure as PltFigure
 from sklearn.manifold import TSNE
 from dataclasses import asdict, dataclass
 from typing import Any, Generator, override, Callable
@@ -113,9 +113,10 @@ class TSneVisualization(IVisualizer[TSneVisualizationConfig]):
         categories       = data.get_field_values(cfg.category_field)
         category_colors  = {x:p for p,x in zip(palette, sorted(set(categories)))}
         colors           = [category_colors[x] for x in categories]
-        embedding_fields = [x for x in data.fields.keys() if x.startswith(cfg.embedding_field_prefix)]
 
-        X = np.asarray([data.get_field_values(x) for x in embedding_fields]).T
+        X = data.get_matrix_field(cfg.embedding_field_prefix)
+        if isinstance(X, sparse.csr_matrix):
+            X = X.toarray()
 
         X_embedded = (TSNE(n_components  = 2, 
                            learning_rate = 'auto',
@@ -125,13 +126,13 @@ class TSneVisualization(IVisualizer[TSneVisualizationConfig]):
 
         marker = cfg.marker if cfg.marker in self._markers else self._markers[0]
 
-        fig, ax = plt.subplots(figsize=(10, 5))
+        fig = PltFigure(figsize=(10, 5))
+        ax  = fig.subplots()
         ax.scatter(X_embedded[:, 0], X_embedded[:, 1], marker=marker, c=colors)
         ax.set_title(f"{cfg.title}\n(perplexity: {cfg.perplexity:d})")
         ax.spines[['left', 'bottom', 'right', 'top']].set_visible(False)
         ax.get_xaxis().set_visible(False)
         ax.get_yaxis().set_visible(False)
-        plt.close(fig)
 
         return [Result(method_id   = self.id,
                        result_name = self._config.output_name,
@@ -1,7 +1,7 @@
 __all__ = ["WordCloudConfig", "WordCloud"]
 
 from matplotlib.colors import Colormap
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure as PltFigure
 from wordcloud import WordCloud as WordCloudFigure
 from dataclasses import asdict, dataclass
 from typing import Any, Callable, Generator, override
@@ -107,10 +107,10 @@ class WordCloud(IVisualizer[WordCloudConfig]):
                                      background_color = cfg.figure_bg)
                         .generate(text))
 
-        fig, ax = plt.subplots(figsize=(10, 5))
+        fig = PltFigure(figsize=(10, 5))
+        ax  = fig.subplots()
         ax.imshow(wordcloud, interpolation="bilinear")
         ax.axis("off")
-        plt.close(fig)
 
         return [Result(method_id   = self.id,
                        result_name = self._config.output_name,
@@ -0,0 +1,66 @@
+__all__ = ["UniqueValues"]
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from typing import Any
+
+
+class UniqueValues:
+    """
+    Factorised field values: the distinct values (in order of first
+    appearance) and, for every row, the index of its value. Steps compute
+    on the distinct values only and broadcast the outputs back to the rows,
+    so that exact duplicates are processed once.
+    """
+
+    def __init__(self, values: list[Any] | np.ndarray) -> None:
+
+        # Token lists are factorised by their (hashable) tuples
+        tokens = len(values) > 0 and isinstance(values[0], list)
+        keys   = [tuple(x) for x in values] if tokens else values
+
+        codes, uniques = pd.factorize(pd.Series(keys, dtype = object), use_na_sentinel = False)
+
+        self._codes  = codes
+        self._values = [list(x) for x in uniques] if tokens else list(uniques)
+
+    @property
+    def values(self) -> list[Any]:
+        return self._values
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._codes
+
+    @property
+    def n_rows(self) -> int:
+        return len(self._codes)
+
+    @property
+    def ratio(self) -> float:
+        """
+        Share of the rows that are duplicates
+        """
+        return 1 - len(self._values) / self.n_rows if self.n_rows else 0.0
+
+    def broadcast(self, outputs: list[Any] | np.ndarray) -> np.ndarray:
+        """
+        Maps outputs of the distinct values (a list or an array) back to
+        all the rows
+        """
+
+        if isinstance(outputs, list):
+            outputs = pd.Series(outputs).to_numpy() # same dtype inference as the dataset
+
+        return outputs[self._codes]
+
+    def broadcast_matrix(self, outputs: np.ndarray | csr_matrix) -> np.ndarray | csr_matrix:
+        """
+        Maps the rows of a matrix of the distinct values back to all the
+        rows
+        """
+        return outputs[self._codes]
+
+    def __str__(self) -> str:
+        return f"{len(self._values)} unique of {self.n_rows} values ({self.ratio:.1%} duplicates)"
@@ -1,16 +1,20 @@
 __all__ = ["WorkflowConfig", "Workflow"]
 
+import re
+import time
 import importlib
-from dataclasses import asdict, dataclass
-from typing import Any, override, get_args
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, override, get_args
 
 from .interface import IDataset, IMethod, IConfig, ILogger 
-from .interface import IPreprocessor, IEmbedder, IAnalyser, IPredictor, IEvaluator, IVisualizer, IResultCreator
+from .interface import IPreprocessor, IEmbedder, IAnalyser, IPartialAnalyser, IPredictor, IEvaluator, IVisualizer, IResultCreator
 from .trait import get_object_id, Identifiable, Configurable
 from .aliases import NamedResults, UsedResults, WorkFlowResults, FieldSchema, AnalysisField, AnalysisFields, Result, WorkflowTracker
 from .aliases import MethodSchema, WorkflowSchema
 
 from .runtime import Runtime
+from .cache import StepCache
 
 
 @dataclass
@@ -87,16 +91,317 @@ class Workflow(Identifiable, Configurable[WorkflowConfig]):
 
         return self
 
+    def uses_field(self, field: str, from_step: int = 0, steps: set[int] | None = None) -> bool:
+        """
+        Returns whether a step (starting with `from_step`, and among `steps`
+        if given) requires the field, or, if starting with the first step,
+        the sql filter uses it
+        """
+
+        if from_step == 0 and (filter := self._config.sql_filter):
+            if re.search(rf"(?<![\w`]){re.escape(field)}(?![\w`])|`{re.escape(field)}`", filter):
+                return True
+
+        for sid, step in enumerate(self._steps[from_step:], start = from_step):
+            if steps is not None and sid not in steps:
+                continue
+
+            for rfield, schema in step.get_required_fields().items():
+                if field == rfield or (schema.prefix and field.startswith(rfield)):
+                    return True
+
+        return False
+
+    def _is_transforming(self, step: IMethod[Any]) -> bool:
+        """
+        Transforming steps create a new version of the dataset and are
+        therefore run in sequence
+        """
+        return isinstance(step, (IPreprocessor, IEmbedder, IPredictor))
+
+    def _get_dependencies(self) -> list[list[int]]:
+        """
+        Returns the indices of the steps each step depends on: the last
+        transforming step before it and the steps creating its required
+        results
+        """
+
+        producers:    dict[str, int]  = {}
+        dependencies: list[list[int]] = []
+        last_transforming: int | None = None
+
+        for sid, step in enumerate(self._steps):
+            deps = set() if last_transforming is None else {last_transforming}
+
+            if isinstance(step, IResultCreator):
+                deps |= {producers[x] for x in step.get_required_results() if x in producers}
+
+                for name in step.get_created_results():
+                    producers[name] = sid
+
+            if self._is_transforming(step):
+                last_transforming = sid
+
+            dependencies.append(sorted(deps))
+
+        return dependencies
+
+    def _get_critical_path(self, 
+                           dependencies: list[list[int]], 
+                           durations:    list[float]) -> tuple[list[int], float]:
+
+        finish: list[float] = []
+        previous: list[int | None] = []
+
+        for sid, deps in enumerate(dependencies):
+            before = max(deps, key = lambda x: finish[x], default = None)
+
+            previous.append(before)
+            finish.append((finish[before] if before is not None else 0) + durations[sid])
+
+        path = []
+        sid  = max(range(len(finish)), key = lambda x: finish[x], default = None)
+        while sid is not None:
+            path.insert(0, sid)
+            sid = previous[sid]
+
+        return path, max(finish, default = 0)
+
+    def _get_cache_key(self, 
+                       step:        IMethod[Any], 
+                       data:        IDataset, 
+                       result_keys: dict[str, str]) -> str | None:
+        """
+        Returns the cache key of a step run: its class and configuration,
+        the fingerprints of its input fields and of the data partition, 
+        the fields it writes and the keys of the steps creating its 
+        required results. 
+        
+        Returns None (not cacheable), if a required result was not 
+        created by a cacheable step of this workflow.
+        """
+
+        required_results = {}
+        if isinstance(step, IResultCreator):
+            for name in step.get_required_results():
+                if name not in result_keys:
+                    return None
+
+                required_results[name] = result_keys[name]
+
+        return StepCache.get_key(module    = step.__module__,
+                                 classname = step.__class__.__name__,
+                                 config    = step.get_config().to_dict(),
+                                 fields    = {x: data.fingerprint(x) for x in step.get_required_fields()},
+                                 writes    = sorted(self._get_written_fields(step)),
+                                 partition = data.fingerprint(),
+                                 results   = required_results)
+
+    def _get_written_fields(self, step: IMethod[Any]) -> dict[AnalysisField, FieldSchema]:
+        """
+        Returns the fields a step writes: the ones it creates or, for a
+        preprocessor creating none, its input fields (rewritten in place)
+        """
+
+        created = step.get_created_fields()
+        if not created and isinstance(step, IPreprocessor):
+            return step.get_required_fields()
+
+        return created
+
+    def get_stream_steps(self, keep: Callable[[str], bool]) -> set[int]:
+        """
+        Returns the indices of the steps to run on streamed chunks (see
+        `transform`): the partial analysers, and the transforming steps 
+        writing fields that these steps require or keep(field) is true for
+        """
+
+        steps: set[int] = set()
+        for sid in reversed(range(len(self._steps))):
+            step = self._steps[sid]
+
+            if isinstance(step, IPartialAnalyser):
+                steps.add(sid)
+
+            elif self._is_transforming(step):
+                if any([keep(x) or self.uses_field(x, from_step = sid + 1, steps = steps) for x in self._get_written_fields(step)]):
+                    steps.add(sid)
+
+        return steps
+
+    def _get_created_values(self, step: IMethod[Any], data: IDataset) -> dict[str, Any]:
+        values = {}
+
+        for field, schema in self._get_written_fields(step).items():
+            if not schema.prefix:
+                values[field] = data.get_field_values(field)
+                continue
+
+            # Prefix fields named {prefix}0, {prefix}1, ... are stored as a matrix
+            names = [x for x in data.fields if x.startswith(field)]
+            if names == [f"{field}{i}" for i in range(len(names))]:
+                values[field] = data.get_matrix_field(field)
+            else:
+                values.update({x: data.get_field_values(x) for x in names})
+
+        return values
+
+    def _set_created_values(self, data: IDataset, values: dict[str, Any]) -> None:
+        for field, value in values.items():
+            if isinstance(value, list):
+                data.set_field_values(field, value)
+            else:
+                data.set_matrix_field(field, value)
+
+    def _get_model_keys(self, sid: int, step: IMethod[Any], data: IDataset) -> tuple[str, str]:
+        """
+        Returns the name and the key of the fitted model of a step: the name
+        is a hash of the classes and configurations of the steps up to it 
+        (its lineage), the key also includes the fingerprints of its input
+        fields in the training data
+        """
+
+        name = StepCache.get_key(lineage = [{"module":    x.__module__,
+                                             "classname": x.__class__.__name__,
+                                             "config":    x.get_config().to_dict()} for x in self._steps[:sid + 1]])
+
+        key = StepCache.get_key(lineage = name,
+                                fields  = {x: data.train_data.fingerprint(x) for x in step.get_required_fields()})
+
+        return name, key
+
+    def _train_step(self,
+                    sid:     int,
+                    step:    IEmbedder[Any] | IPredictor[Any],
+                    runtime: Runtime | None,
+                    data:    IDataset,
+                    logger:  ILogger | None = None) -> None:
+        """
+        Trains an embedder or predictor, unless it is trained already or a
+        model fitted on the same data is stored (in predict-only runs, the
+        latest stored model of the step is used and nothing is trained)
+        """
+
+        if step.is_trained:
+            return
+
+        store        = runtime.model_store if runtime else None
+        predict_only = runtime.predict_only if runtime else False
+
+        if store is None:
+            if predict_only:
+                raise Exception(f"Cannot run step '{step.name}' - no model store for predict-only runs")
+
+            step.train(data)
+            return
+
+        name, key = self._get_model_keys(sid, step, data)
+
+        state = store.load_latest(name) if predict_only else store.load(key)
+        if state is not None:
+            step.set_state(state)
+
+            if logger:
+                logger.log(f"Using stored model of step '{step.name}'")
+
+            return
+
+        if predict_only:
+            raise Exception(f"Cannot run step '{step.name}' - no stored model (train it in a run first)")
+
+        step.train(data)
+
+        # Failing to store the model does not fail the run
+        try:
+            store.save(key, name, step.get_state(), {"step":      step.name,
+                                                     "classname": step.__class__.__name__,
+                                                     "workflow":  self.name})
+        except Exception as e:
+            if logger:
+                logger.log(f"Cannot store model of step '{step.name}' - {e}")
+
+    def _run_step(self,
+                  sid:     int,
+                  step:    IMethod[Any],
+                  runtime: Runtime,
+                  data:    IDataset,
+                  results: NamedResults,
+                  tracker: WorkflowTracker | None = None,
+                  logger:  ILogger | None = None) -> tuple[IDataset, list[Result]]:
+        """
+        Runs a single step. A step is allowed to have several roles
+        (be an instance of different step types).
+        """
+
+        if logger:
+            logger.log(f"Running step '{step.name}'")
+
+        if tracker:
+            tracker(sid, step.name)
+
+        step_results: list[Result] = []
+
+        if isinstance(step, IPreprocessor):
+            data = step.preprocess(data)
+
+        if isinstance(step, IEmbedder):
+            self._train_step(sid, step, runtime, data, logger)
+
+            data = step.embed(data)
+
+        if isinstance(step, IAnalyser):
+            step_results += step.analyse(data        = data, 
+                                         results     = results,
+                                         new_dataset = runtime.new_dataset)
+
+        if isinstance(step, IPredictor):
+            self._train_step(sid, step, runtime, data, logger)
+
+            data = step.predict(data)
+
+        if isinstance(step, IEvaluator):
+            step_results += step.evaluate(data = data, 
+                                          new_dataset = runtime.new_dataset)
+
+        if isinstance(step, IVisualizer):
+            step_results += step.visualize(data       = data, 
+                                           results    = results, 
+                                           palette    = runtime.palette(),
+                                           colormap   = runtime.colormap,
+                                           new_figure = runtime.new_figure)
+
+        for msg in step.pop_messages():
+            if logger:
+                logger.log(f"Step '{step.name}': {msg}")
+
+        return data, step_results
+
     def run(self, 
             runtime: Runtime, 
             data:    IDataset,
             created_named_results: NamedResults | None = None,
             tracker: WorkflowTracker| None = None,
-            logger:  ILogger | None = None) -> tuple[IDataset, WorkFlowResults, NamedResults]:
+            logger:  ILogger | None = None,
+            keep:    Callable[[str], bool] | None = None,
+            precomputed: WorkFlowResults | None = None,
+            reused:  dict[str, dict[str, Any]] | None = None) -> tuple[IDataset, WorkFlowResults, NamedResults]:
         """
         Runs through all steps in the workflow and applies them
-        on the dataset. A step is allowed to have several roles
-        (be an instance of different step types).
+        on the dataset. 
+
+        If `keep` is given, fields are dropped as soon as no later step 
+        requires them, unless keep(field) is true.
+
+        Result-only steps with `precomputed` results (by step id) are not
+        run, their precomputed results are used instead. Transforming steps
+        with `reused` values (by step id, see `transform`) are not run 
+        either, their values are set instead.
+
+        Transforming steps (preprocessors, embedders, predictors) are run
+        in order. Steps only creating results are run concurrently (up to
+        runtime.max_workers) on a snapshot of the dataset, as soon as the
+        transforming step before them and the steps creating their 
+        required results are done.
         """
 
         data = data.copy()
@@ -107,58 +412,180 @@ class Workflow(Identifiable, Configurable[WorkflowConfig]):
         results:       WorkFlowResults = {}
         named_results: NamedResults = created_named_results or {}
 
-        def organize_results(step_results: list[Result]) -> None:
-            results[mid] += step_results
-            named_results.update({r.result_name: r for r in step_results})
+        dependencies = self._get_dependencies()
+        durations    = [0.0] * len(self._steps)
+        previous     = dict(named_results)
+        step_results: dict[int, Future[list[Result]]] = {}
+        result_keys:  dict[str, str] = {}
+        cache = runtime.step_cache
+        precomputed = precomputed or {}
+        reused      = reused or {}
+
+        def run_step(sid: int, step: IMethod[Any], data: IDataset) -> tuple[IDataset, list[Result]]:
+
+            # Results of the steps it depends on
+            available = dict(previous)
+            for dep in dependencies[sid]:
+                if dep in step_results:
+                    available.update({r.result_name: r for r in step_results[dep].result()})
+
+            start = time.perf_counter()
+
+            # Outputs of earlier runs may not be the ones of the latest stored models
+            cacheable = step.id not in precomputed and step.id not in reused and \
+                        not (runtime.predict_only and isinstance(step, (IEmbedder, IPredictor)))
+
+            key   = self._get_cache_key(step, data, result_keys) if cache and cacheable else None
+            entry = cache.get(key) if cache and key else None
+
+            if step.id in precomputed:
+                if tracker:
+                    tracker(sid, step.name)
+
+                created = precomputed[step.id]
+            elif step.id in reused:
+                if tracker:
+                    tracker(sid, step.name)
+
+                self._set_created_values(data, reused[step.id])
+                created = []
+            elif entry is not None:
+                if logger:
+                    logger.log(f"Using cached output of step '{step.name}'")
+
+                if tracker:
+                    tracker(sid, step.name)
+
+                values, created = entry
+                self._set_created_values(data, values)
+                created = [replace(x, method_id = step.id) for x in created]
+            else:
+                data, created = self._run_step(sid, step, runtime, data, available, tracker, logger)
+
+                if cache and key:
+                    cache.put(key, self._get_created_values(step, data), created)
+
+            if key:
+                result_keys.update({x.result_name: key for x in created})
+
+            durations[sid] = time.perf_counter() - start
+
+            return data, created
+
+        def run_result_step(sid: int, step: IMethod[Any], data: IDataset) -> list[Result]:
+            return run_step(sid, step, data)[1]
+
+        with ThreadPoolExecutor(max_workers = max(runtime.max_workers, 1)) as pool:
+            for sid, step in enumerate(self._steps):
+                if self._is_transforming(step) or runtime.max_workers <= 1:
+                    data, created = run_step(sid, step, data)
+
+                    step_results[sid] = Future()
+                    step_results[sid].set_result(created)
+                else:
+                    step_results[sid] = pool.submit(run_result_step, sid, step, data.copy())
+
+                # Drop fields not used anymore (running steps use a snapshot)
+                if keep is not None:
+                    unused = [x for x in data.fields if not keep(x) and 
+                                                        not x in (self._config.post_drop_columns or []) and
+                                                        not self.uses_field(x, from_step = sid + 1)]
+                    if unused:
+                        data = data.drop_fields(unused)
+
+            for sid, step in enumerate(self._steps):
+                results[mid := step.id] = step_results[sid].result()
+                named_results.update({r.result_name: r for r in results[mid]})
+
+        if logger and self._steps:
+            path, total = self._get_critical_path(dependencies, durations)
+            logger.log(f"Critical path ({total:.2f}s of {sum(durations):.2f}s): " + 
+                       " -> ".join([f"'{self._steps[x].name}' ({durations[x]:.2f}s)" for x in path]))
+
+        # Drop unnecessary columns
+        if (drop_cols := self._config.post_drop_columns):
+            data = data.drop_fields(drop_cols)
+
+        return data, results, named_results
+
+    def transform(self, 
+                  data:    IDataset, 
+                  states:  dict[int, Any] | None = None,
+                  fit:     bool = False,
+                  runtime: Runtime | None = None,
+                  steps:   set[int] | None = None,
+                  outputs: dict[str, dict[str, Any]] | None = None) -> IDataset:
+        """
+        Applies the filter and the row-local steps (preprocessors, embedders
+        and predictors) to the dataset, so that datasets can be streamed 
+        through the workflow chunk by chunk. Embedders and predictors must
+        have been trained already, unless `fit` is set (then untrained ones
+        are trained on the dataset, or loaded from runtime.model_store).
+
+        If `states` is given, the partial states of the partial analysers 
+        (by step index) are merged with the ones of the dataset.
+
+        If `steps` is given, only these steps are run (see `get_stream_steps`).
+        If `outputs` is given, the values written by the transforming steps
+        are stored into it (by step id), so that `run` can reuse them.
+        """
+
+        data = data.copy()
+
+        if (filter := self._config.sql_filter):
+            data = data.apply_filter(filter)
 
         for sid, step in enumerate(self._steps):
-            if logger:
-                logger.log(f"Running step '{step.name}'")
+            if steps is not None and sid not in steps:
+                continue
 
-            if tracker:
-                tracker(sid, step.name)
+            if isinstance(step, (IEmbedder, IPredictor)) and not step.is_trained:
+                if not fit:
+                    raise Exception(f"Cannot transform data - step '{step.name}' has not been trained")
 
-            results[mid := step.id] = []
+                self._train_step(sid, step, runtime, data)
 
             if isinstance(step, IPreprocessor):
                 data = step.preprocess(data)
 
             if isinstance(step, IEmbedder):
-                if not step.is_trained:
-                    step.train(data)
-
                 data = step.embed(data)
 
-            if isinstance(step, IAnalyser):
-                step_results = step.analyse(data        = data, 
-                                            results     = named_results,
-                                            new_dataset = runtime.new_dataset)
-                organize_results(step_results)
-
             if isinstance(step, IPredictor):
-                if not step.is_trained:
-                    step.train(data)
-
                 data = step.predict(data)
 
-            if isinstance(step, IEvaluator):
-                step_results = step.evaluate(data = data, 
-                                             new_dataset = runtime.new_dataset)
-                organize_results(step_results)
+            if states is not None and isinstance(step, IPartialAnalyser):
+                state = step.partial(data)
+                states[sid] = step.merge(states[sid], state) if sid in states else state
 
-            if isinstance(step, IVisualizer):
-                step_results = step.visualize(data       = data, 
-                                              results    = named_results, 
-                                              palette    = runtime.palette(),
-                                              colormap   = runtime.colormap,
-                                              new_figure = runtime.new_figure)
-                organize_results(step_results)
+            if outputs is not None and self._is_transforming(step) and not isinstance(step, IResultCreator):
+                outputs[step.id] = self._get_created_values(step, data)
 
-        # Drop unnecessary columns
-        if (drop_cols := self._config.post_drop_columns):
+            # Notes are not logged for every chunk
+            step.pop_messages()
+
+        # Fields of skipped steps are missing
+        if (drop_cols := [x for x in self._config.post_drop_columns or [] if x in data.fields]):
             data = data.drop_fields(drop_cols)
 
-        return data, results, named_results
+        return data
+
+    def finalize(self, 
+                 states:      dict[int, Any], 
+                 new_dataset: Callable[[dict[str, list[Any]]], IDataset]) -> WorkFlowResults:
+        """
+        Returns the results of the partial analysers from their merged
+        partial states (see `transform`)
+        """
+
+        results: WorkFlowResults = {}
+        for sid, state in states.items():
+            step = self._steps[sid]
+
+            if isinstance(step, IPartialAnalyser):
+                results[step.id] = step.finalize(state, new_dataset)
+
+        return results
 
     def get_fields(self) -> AnalysisFields:
 
@@ -14,6 +14,10 @@ METHOD_REGISTRY = os.environ.get("METHOD_REGISTRY", "webapp/method_registry.json
 DB_NAME         = os.environ.get("DB_NAME", "reviews.sqlite")
 SESSION_TTL     = os.environ.get("SESSION_TTL", 60*60*24)
 LLM_HOST        = os.environ.get("LLM_HOST", "localhost:11434")
+JOB_WORKERS     = os.environ.get("JOB_WORKERS", 2)
+EXECUTOR        = os.environ.get("EXECUTOR", "thread")
+EXECUTOR_SIZE   = os.environ.get("EXECUTOR_SIZE", os.cpu_count() or 1)
+STEP_CACHE_SIZE = os.environ.get("STEP_CACHE_SIZE", 1024)
 
 # Active configuration
 print("#"*100)
@@ -22,6 +26,9 @@ runtime.log(f"WORK_DIR:        '{WORK_DIR}'")
 runtime.log(f"METHOD_REGISTRY: '{METHOD_REGISTRY}'")
 runtime.log(f"DB_NAME:         '{DB_NAME}'")
 runtime.log(f"LLM_HOST:        '{LLM_HOST}'")
+runtime.log(f"JOB_WORKERS:     '{JOB_WORKERS}'")
+runtime.log(f"EXECUTOR:        '{EXECUTOR}' ({EXECUTOR_SIZE} processes)")
+runtime.log(f"STEP_CACHE_SIZE: '{STEP_CACHE_SIZE}' MB")
 print("#"*100)
 
 # Prepare work dir
@@ -45,9 +52,17 @@ runtime.register_services(application = DefaultApplicationService(logger = runti
 
                           analytics   = DefaultAnalyticsService(logger          = runtime.logger, 
                                                                 work_dir        = WORK_DIR,
-                                                                method_registry = METHOD_REGISTRY),
+                                                                method_registry = METHOD_REGISTRY,
+                                                                executor        = EXECUTOR,
+                                                                max_processes   = int(EXECUTOR_SIZE),
+                                                                cache_size      = int(STEP_CACHE_SIZE)),
 
-                          external    = DefaultExternalService(logger  = runtime.logger, llm_host = runtime.llm_host))
+                          external    = DefaultExternalService(logger  = runtime.logger, llm_host = runtime.llm_host),
+
+                          jobs        = DefaultJobService(logger = runtime.logger, max_workers = int(JOB_WORKERS)))
                                                                
+# Stop the services (and the worker processes) with the application
+app.router.add_event_handler("shutdown", runtime.shutdown)
+
 # Construct application
 runtime.log("App ready")
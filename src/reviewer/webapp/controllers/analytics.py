@@ -20,15 +20,18 @@ __all__ = ["get_method_types",
            "delete_analysis",
            "run_analysis",
 
+           "get_job",
+
+           "get_models",
+
            "get_results",
            "get_result_by_name"
            ]
 
 import io
-from queue import Queue
-import threading
+import asyncio
 import pandas as pd
-from typing import Optional
+from typing import Any, Optional
 from fastapi import File, HTTPException, Header, UploadFile, status
 from sqlalchemy.orm.session import Session
 
@@ -37,6 +40,9 @@ from ..dto  import *
 
 logger = runtime.logger.getChild("API/analytics")
 
+# Running event consumers (referenced until done)
+_consumers: set[asyncio.Task[None]] = set()
+
 # Supporting functions
 
 def _get_user(t: Session, session_token: str) -> UserDTO:
@@ -507,65 +513,112 @@ async def delete_analysis(analysis_name: str,
 @app.post("/api/analysis/{analysis_name}", tags=["analytics :: analysis"])
 async def run_analysis(analysis_name: str,
                        run_setup:     RunSetupDTO,
-                       session_token: str = Header(...)) -> None:
+                       session_token: str = Header(...)) -> JobDTO:
     """
-    Runs an existing analysis
+    Runs an existing analysis in the background and returns its job.
 
+    Step progress is emitted as "step" events, the end of the run as a 
+    "result" event (carrying the job id).
     """
 
     # Services
     analytics = runtime.services.analytics
+    jobs      = runtime.services.jobs
 
-    # Runner thread
-    queue = Queue()
-    done  = threading.Event()
-    error = threading.Event()
+    with runtime.transaction as t:
+        user = _get_user(t, session_token)
+
+    # Events are passed from the worker thread to the event loop
+    loop   = asyncio.get_running_loop()
+    events: asyncio.Queue[Optional[dict[str, Any]]] = asyncio.Queue()
 
     def tracker(wid: int, sid: int, name: str) -> None:
-        queue.put_nowait((wid, sid, name))
+        loop.call_soon_threadsafe(events.put_nowait, {"workflow_idx": wid,
+                                                      "step_idx":     sid,
+                                                      "step":         name})
 
-    def runner():
-        with runtime.transaction as t:
-            user = _get_user(t, session_token)
+    def on_done(job: JobDTO) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, None)
 
+    def runner() -> None:
+        with runtime.transaction as t:
             try:
-                analytics.run_analysis(t, 
-                                       user          = user, 
-                                       analysis_name = analysis_name,
-                                       dataset_name  = run_setup.dataset_name, 
-                                       max_rows      = run_setup.max_rows,
-                                       mapping       = run_setup.mapping, 
-                                       analysis      = run_setup.analysis,
-                                       tracker       = tracker)
+                results = analytics.run_analysis(t, 
+                                                 user           = user, 
+                                                 analysis_name  = analysis_name,
+                                                 dataset_name   = run_setup.dataset_name, 
+                                                 max_rows       = run_setup.max_rows,
+                                                 mapping        = run_setup.mapping, 
+                                                 analysis       = run_setup.analysis,
+                                                 tracker        = tracker,
+                                                 train_part     = run_setup.train_part,
+                                                 seed           = run_setup.seed,
+                                                 stratify_field = run_setup.stratify_field,
+                                                 chunk_size     = run_setup.chunk_size,
+                                                 predict_only   = run_setup.predict_only)
+
+                if results is None:
+                    raise Exception("Analysis failed")
 
                 t.commit()
-                done.set()
 
             except:
                 t.rollback()
-                error.set()
+                raise
 
-    thread = threading.Thread(target=runner)
-    thread.start()
+    job = jobs.submit(user, analysis_name, task = runner, on_done = on_done)
 
-    while not done.is_set() and not error.is_set():
-        try:
-            (wid, sid, name) = queue.get_nowait()
-            await sio.emit("step", {"workflow_idx": wid,
-                                    "step_idx": sid,
-                                    "step": name})
-        except:
-            pass
+    async def consumer() -> None:
+        while (event := await events.get()) is not None:
+            await sio.emit("step", event)
 
-    thread.join()
+        await sio.emit("result", {"job_id": job.job_id})
 
-    await sio.emit("result", {})
-    
-    if error.is_set():
-        raise HTTPException(status_code = status.HTTP_400_BAD_REQUEST,
-                            detail = "Analysis failed")
+    task = asyncio.create_task(consumer())
+    _consumers.add(task)
+    task.add_done_callback(_consumers.discard)
 
-    return None
+    return job
+
+##################################
+# API: jobs
+##################################
+
+@app.get("/api/jobs/{job_id}", tags=["analytics :: jobs"])
+def get_job(job_id:        str,
+            session_token: str = Header(...)) -> JobDTO:
+    """
+    Returns the status of a background job
+    """
+
+    # Services
+    jobs = runtime.services.jobs
+
+    with runtime.transaction as t:
+        user = _get_user(t, session_token)
+
+    job = jobs.get_job(user, job_id)
+    if job is None:
+        raise HTTPException(status_code = status.HTTP_404_NOT_FOUND,
+                            detail = "Job not found")
+
+    return job
+
+##################################
+# API: models
+##################################
+
+@app.get("/api/models", tags=["analytics :: models"])
+def get_models(session_token: str = Header(...)) -> list[ModelDTO]:
+
+    # Services
+    analytics = runtime.services.analytics
+
+    with runtime.transaction as t:
+        user   = _get_user(t, session_token)
+        models = analytics.get_models(t, user)
+
+    return models
 
 ##################################
 # API: results
@@ -19,6 +19,10 @@ __all__ = [ "MethodType",
             "AnalysisFieldsDTO",
             "RunSetupDTO",
             "RunDTO",
+            "ModelDTO",
+
+            "JobStatus",
+            "JobDTO",
 
             "ResultType",
             "RawResultDTO",
@@ -63,6 +67,13 @@ class MethodType(Enum):
     VISUALIZATION         = "visualization"
     LLM                   = "llm"
 
+class JobStatus(Enum):
+
+    QUEUED   = "queued"
+    RUNNING  = "running"
+    DONE     = "done"
+    FAILED   = "failed"
+
 # Generics
 T = TypeVar("T", bound = IConfig)
 
@@ -176,10 +187,15 @@ class AnalysisFieldsDTO(BaseModel):
 
 @dataclass 
 class RunSetupDTO:
-    dataset_name: str
-    max_rows:     int | None
-    mapping:      dict[str, str]
-    analysis:     AnalysisDTO
+    dataset_name:   str
+    max_rows:       int | None
+    mapping:        dict[str, str]
+    analysis:       AnalysisDTO
+    train_part:     float      = 0.8
+    seed:           int | None = None
+    stratify_field: str | None = None
+    chunk_size:     int | None = None
+    predict_only:   bool       = False
 
 @dataclass 
 class RunDTO:
@@ -189,6 +205,24 @@ class RunDTO:
     result_count:    int
     created_at_utc:  datetime
 
+@dataclass 
+class ModelDTO:
+    key:            str
+    name:           str
+    step:           str
+    classname:      str
+    workflow:       str
+    created_at_utc: datetime
+
+@dataclass 
+class JobDTO:
+    job_id:          str
+    name:            str
+    status:          JobStatus
+    error:           str | None
+    created_at_utc:  datetime
+    finished_at_utc: datetime | None = None
+
 @dataclass 
 class ResultDTO:
     result_name: str
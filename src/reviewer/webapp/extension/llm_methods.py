@@ -9,6 +9,7 @@ from .. import runtime
 
 from reviewer.framework.interface import IConfig, IDataset, IPredictor
 from reviewer.framework.aliases import AnalysisField, FieldSchema
+from reviewer.framework.unique import UniqueValues
 
 
 @dataclass
@@ -110,8 +111,10 @@ class LLMPredictor(IPredictor[LLMPredictorConfig]):
         # Create predictions
         y_probs = []
         y_class = []
-        texts = data.get_field_values(self._config.review_field)
-        for text in texts:
+
+        # Each distinct review is sent to the model once
+        unique = UniqueValues(data.get_field_values(self._config.review_field))
+        for text in unique.values:
             prompt   = text_prompt(text)
             response = client.chat(messages = [
                                 {
@@ -134,8 +137,10 @@ class LLMPredictor(IPredictor[LLMPredictorConfig]):
                 y_probs.append(0.0)
                 y_class.append(self._classes[0])
 
-        data.set_field_values(self._config.output_prob_field,  y_probs)
-        data.set_field_values(self._config.output_class_field, y_class)
+        data.set_field_values(self._config.output_prob_field,  unique.broadcast(y_probs))
+        data.set_field_values(self._config.output_class_field, unique.broadcast(y_class))
+
+        self.note(f"Predicted {unique}")
 
         return data
 
@@ -1,6 +1,6 @@
-__all__ = ["ApplicationService", "AnalyticsService", "ExternalService", 
+__all__ = ["ApplicationService", "AnalyticsService", "ExternalService", "JobService",
            "Repository"]
            
 
-from .service import ApplicationService, AnalyticsService, ExternalService 
+from .service import ApplicationService, AnalyticsService, ExternalService, JobService
 from .repository import Repository
@@ -3,10 +3,12 @@ Service / Subsystem interfaces
 """
 __all__ = ["ApplicationService",
            "AnalyticsService",
-           "ExternalService"]
+           "ExternalService",
+           "JobService"]
            
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from typing import Any, Optional, Type, TypeVar
 
 from sqlalchemy.orm import Session
@@ -24,6 +26,13 @@ class Service(ABC):
     def __init__(self) -> None:
         super().__init__()
 
+    def shutdown(self) -> None:
+        """
+        Releases the resources of the service (called once, when the
+        application stops)
+        """
+        pass
+
 
 class ApplicationService(Service):
     """
@@ -202,7 +211,8 @@ class AnalyticsService(Service):
                             user: UserDTO, 
                             dataset_name: str,
                             with_data: bool = True,
-                            max_rows: int | None = None) -> Optional[DatasetDTO]:
+                            max_rows: int | None = None,
+                            columns: list[str] | None = None) -> Optional[DatasetDTO]:
         raise NotImplementedError()
 
     @abstractmethod
@@ -258,14 +268,25 @@ class AnalyticsService(Service):
 
     @abstractmethod
     def run_analysis(self, 
-                           t:             Session,
-                           user:          UserDTO,
-                           analysis_name: str,
-                           dataset_name:  str,
-                           max_rows:      int | None,
-                           mapping:       dict[str, str],
-                           analysis:      AnalysisDTO,
-                           tracker:       AnalysisTracker) -> Optional[RawResultsDTO]:
+                           t:              Session,
+                           user:           UserDTO,
+                           analysis_name:  str,
+                           dataset_name:   str,
+                           max_rows:       int | None,
+                           mapping:        dict[str, str],
+                           analysis:       AnalysisDTO,
+                           tracker:        AnalysisTracker,
+                           train_part:     float      = 0.8,
+                           seed:           int | None = None,
+                           stratify_field: str | None = None,
+                           chunk_size:     int | None = None,
+                           predict_only:   bool       = False) -> Optional[RawResultsDTO]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_models(self,
+                   t:    Session,
+                   user: UserDTO) -> list[ModelDTO]:
         raise NotImplementedError()
 
     @abstractmethod
@@ -317,3 +338,28 @@ class ExternalService(Service):
     def __init__(self) -> None:
         super().__init__()
 
+
+class JobService(Service):
+    """
+    Job Service / Subsystem
+
+    Runs long-running tasks (e.g. analyses) in the background and keeps
+    track of their status
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    @abstractmethod
+    def submit(self,
+               user:    UserDTO,
+               name:    str,
+               task:    Callable[[], Any],
+               on_done: Callable[[JobDTO], None] | None = None) -> JobDTO:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_job(self,
+                user:   UserDTO,
+                job_id: str) -> Optional[JobDTO]:
+        raise NotImplementedError()
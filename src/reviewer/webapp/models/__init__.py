@@ -5,6 +5,7 @@ __all__ = ["ORM_BASE",
            "DatasetRepository",
            "AnalysisRepository",
            "ResultRepository",
+           "ModelRepository",
            ]
            
 from sqlalchemy.orm import declarative_base
@@ -17,3 +18,4 @@ from .workflow import *
 from .dataset  import *
 from .analysis import *
 from .result   import *
+from .model    import *
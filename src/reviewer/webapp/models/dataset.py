@@ -3,11 +3,17 @@ Dataset data model and repository
 
 Is used to persistently store and represent a Dataset.
 For transportation purposes DatasetDTO is used.
+
+Data is stored as an (uncompressed) Arrow IPC file, so that it can be
+memory-mapped and read column-wise. Datasets stored as CSV files by
+earlier versions are converted on first access.
 """
 __all__ = ["DatasetRepository"]
 
 import os
+import uuid
 import pandas as pd
+import pyarrow as pa
 from pandas import DataFrame
 from sqlalchemy import ForeignKey, Integer, String, func, true
 from sqlalchemy.orm import mapped_column, Session
@@ -42,6 +48,84 @@ class DatasetRepository(Repository):
     def _get_clean_dataset_name(self, dataset_name: str) -> str:
         return dataset_name.strip().lower().replace(" ","_")
 
+    def _get_dataset_path(self, user_id: int, dataset_name: str) -> str:
+        clean_name = self._get_clean_dataset_name(dataset_name)
+
+        return f"{self._data_dir}/{user_id}/{clean_name}.arrow"
+
+    def _get_legacy_path(self, user_id: int, dataset_name: str) -> str:
+        clean_name = self._get_clean_dataset_name(dataset_name)
+
+        return f"{self._data_dir}/{user_id}/{clean_name}.csv"
+
+    def _write_data(self, dpath: str, df: DataFrame) -> None:
+        """
+        Stores the data as a single record batch (uncompressed), which
+        allows zero-copy reads of the numeric columns.
+
+        The file is replaced atomically: runs may have the previous file
+        memory-mapped, which must not be truncated under them.
+        """
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index = False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed-type columns are stored as strings
+            df    = df.assign(**{str(c): df[c].map(lambda x: None if pd.isna(x) else str(x))
+                                 for c in df.columns if df[c].dtype == object})
+            table = pa.Table.from_pandas(df, preserve_index = False)
+
+        table = table.combine_chunks()
+
+        temp = f"{dpath}.{uuid.uuid4().hex}.tmp"
+
+        try:
+            with pa.OSFile(temp, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table, max_chunksize = max(table.num_rows, 1))
+
+            os.replace(temp, dpath)
+        finally:
+            if os.path.isfile(temp):
+                os.unlink(temp)
+
+    def _read_data(self, 
+                   dpath:    str,
+                   columns:  list[str] | None = None,
+                   max_rows: int | None = None) -> DataFrame:
+
+        with pa.memory_map(dpath, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+
+            if columns is not None:
+                table = table.select([x for x in table.column_names if x in set(columns)])
+
+            if max_rows:
+                table = table.slice(0, max_rows)
+
+            return table.to_pandas()
+
+    def _ensure_data_file(self, user_id: int, dataset_name: str) -> Optional[str]:
+        """
+        Returns the path of the dataset file, converting a legacy CSV
+        file if necessary. Returns None, if neither file exists.
+        """
+
+        dpath = self._get_dataset_path(user_id, dataset_name)
+        if os.path.isfile(dpath):
+            return dpath
+
+        lpath = self._get_legacy_path(user_id, dataset_name)
+        if not os.path.isfile(lpath):
+            return None
+
+        # Convert CSV file (once)
+        df = pd.read_csv(lpath, sep=";", decimal=",", encoding="utf-8")
+        self._write_data(dpath, df)
+        os.unlink(lpath)
+
+        return dpath
+
     def get_dataset_count(self, session: Session, user_id: Optional[int]) -> int:
         return (session
                 .query(Dataset)
@@ -56,8 +140,6 @@ class DatasetRepository(Repository):
         Returns all of user's datasets
         """
 
-        user_ddir = f"{self._data_dir}/{user_id}"
-        
         ds = (session
                 .query(Dataset)
                 .filter(Dataset.user_id == user_id)
@@ -68,9 +150,8 @@ class DatasetRepository(Repository):
         for d in ds:
 
             # Skip if file does not exist
-            clean_name = self._get_clean_dataset_name(d.name)
-            dpath = f"{user_ddir}/{clean_name}.csv"
-            if not os.path.isfile(dpath):
+            if not os.path.isfile(self._get_dataset_path(user_id, d.name)) and \
+               not os.path.isfile(self._get_legacy_path(user_id, d.name)):
                 continue
 
             # Add DTO without data
@@ -82,18 +163,41 @@ class DatasetRepository(Repository):
 
         return datasets
 
+    def get_dataset_path(self,
+                         session:      Session,
+                         user_id:      int,
+                         dataset_name: str) -> Optional[str]:
+
+        """
+        Returns the path of a dataset's (memory-mappable) data file, 
+        if the dataset exists
+        """
+
+        d = (session
+             .query(Dataset)
+             .filter(Dataset.user_id == user_id,
+                     func.lower(Dataset.name) == dataset_name.strip().lower())
+             .first())
+
+        if d is None:
+            return None
+
+        return self._ensure_data_file(user_id, d.name)
+
     def get_dataset_by_name(self,
                             session:      Session,
                             user_id:      int,
                             dataset_name: str,
                             with_data:    bool = True,
-                            max_rows:     int | None = None) -> Optional[DatasetDTO]:
+                            max_rows:     int | None = None,
+                            columns:      list[str] | None = None) -> Optional[DatasetDTO]:
 
         """
-        Returns a single dataset by its name, if it exists
-        """
+        Returns a single dataset by its name, if it exists.
 
-        user_ddir = f"{self._data_dir}/{user_id}"
+        Only the given columns (all by default) and the first max_rows
+        rows are read.
+        """
 
         # Check data record existence
         d = (session
@@ -106,19 +210,13 @@ class DatasetRepository(Repository):
             return None
 
         # Check file existence
-        clean_name = self._get_clean_dataset_name(d.name)
-        dpath = f"{user_ddir}/{clean_name}.csv"
-        if not os.path.isfile(dpath):
+        dpath = self._ensure_data_file(user_id, d.name)
+        if dpath is None:
             return None
 
-        # Load csv file
+        # Load data file
         if with_data:
-            df = pd.read_csv(dpath, sep=";", decimal=",", encoding="utf-8")
-
-            if max_rows:
-                df = df.head(max_rows)
-
-            data = df.to_dict("list")
+            data = self._read_data(dpath, columns = columns, max_rows = max_rows).to_dict("list")
         else:
             data = None
 
@@ -137,7 +235,7 @@ class DatasetRepository(Repository):
                     dataset: DatasetDTO) -> str:
 
         """
-        Creates a dataset record and stores the data to disk as a CSV file
+        Creates a dataset record and stores the data to disk as an Arrow file
         """
 
         user_ddir = f"{self._data_dir}/{user_id}"
@@ -159,15 +257,14 @@ class DatasetRepository(Repository):
         # Create user dir
         os.makedirs(user_ddir, exist_ok = True)
 
-        # Verify non-existence of the schema-file
-        clean_name = self._get_clean_dataset_name(dataset.name)
-        dpath = f"{user_ddir}/{clean_name}.csv"
-        if os.path.isfile(dpath):
+        # Verify non-existence of the data file
+        dpath = self._get_dataset_path(user_id, dataset.name)
+        if os.path.isfile(dpath) or os.path.isfile(self._get_legacy_path(user_id, dataset.name)):
             raise Exception("Dataset file exists")
 
-        # Store CSV file
+        # Store data file
         df = DataFrame(dataset.data)
-        df.to_csv(dpath, sep=";", decimal=",", index=False)
+        self._write_data(dpath, df)
 
         # Create database record
         d = Dataset(user_id   = user_id,
@@ -188,15 +285,13 @@ class DatasetRepository(Repository):
                        dataset:      DatasetDTO) -> str:
 
         """
-        Modifies an existing dataset by overwriting its csv-file
+        Modifies an existing dataset by overwriting its data file
         and modifying the database record.
 
         If the database record does not exist, an exception is thrown.
-        The non-existence of the csv file does not cause an exception.
+        The non-existence of the data file does not cause an exception.
         """
 
-        user_ddir = f"{self._data_dir}/{user_id}"
-
         # Check existence
         d = (session
                 .query(Dataset)
@@ -207,12 +302,15 @@ class DatasetRepository(Repository):
         if d is None:
             raise Exception("Dataset does not exist")
 
-        # Store CSV file
-        clean_name = self._get_clean_dataset_name(dataset_name)
-        dpath      = f"{user_ddir}/{clean_name}.csv"
+        # Store data file
+        dpath = self._get_dataset_path(user_id, dataset_name)
+        lpath = self._get_legacy_path(user_id, dataset_name)
 
         df = DataFrame(dataset.data)
-        df.to_csv(dpath, sep=";", decimal=",", index=False)
+        self._write_data(dpath, df)
+
+        if os.path.isfile(lpath):
+            os.unlink(lpath)
 
         # Update data record
         d.n_rows    = df.shape[0]
@@ -229,20 +327,17 @@ class DatasetRepository(Repository):
                        dataset_name: str) -> None:
         """
         Deletes an existing dataset from the database and its
-        csv file from the filesystem.
+        data file from the filesystem.
 
         This method tries to delete the database record and the schema
         file. If one or both do not exist, no exception is thrown.
         """
 
-        user_ddir = f"{self._data_dir}/{user_id}"
-
-        # Delete CSV file
-        clean_name = self._get_clean_dataset_name(dataset_name)
-        dpath      = f"{user_ddir}/{clean_name}.csv"
-
-        if os.path.isfile(dpath):
-            os.unlink(dpath)
+        # Delete data file
+        for dpath in [self._get_dataset_path(user_id, dataset_name),
+                      self._get_legacy_path(user_id, dataset_name)]:
+            if os.path.isfile(dpath):
+                os.unlink(dpath)
 
         # Delete database record
         d = (session
@@ -0,0 +1,125 @@
+"""
+Model data model and repository
+
+Is used to persistently store and represent the fitted models (trained
+embedders and predictors) of analysis runs. For transportation purposes
+ModelDTO is used.
+
+The models themselves are stored by a ModelStore of the framework (one
+per user), which also writes an information file per model. As runs may
+be executed in other processes, the database records are synchronised
+with these files after each run.
+"""
+
+__all__ = ["ModelRepository"]
+
+import os
+from datetime import datetime, timezone
+from sqlalchemy import ForeignKey, Integer, String, DateTime, true
+from sqlalchemy.orm import mapped_column, Session
+from typing import Optional
+
+from . import ORM_BASE
+from ..interfaces import Repository
+from ..dto import ModelDTO
+
+from reviewer.framework import ModelStore
+
+
+class Model(ORM_BASE):
+    __tablename__ = "meta_model"
+
+    id         = mapped_column(Integer, primary_key=True)
+    user_id    = mapped_column(Integer, ForeignKey("user.id"), nullable=False)
+    key        = mapped_column(String,  nullable=False)
+    name       = mapped_column(String,  nullable=False)
+    step       = mapped_column(String,  nullable=False)
+    classname  = mapped_column(String,  nullable=False)
+    workflow   = mapped_column(String,  nullable=False)
+    created_at = mapped_column(DateTime)
+
+
+class ModelRepository(Repository):
+
+    def __init__(self,
+                 model_dir: str) -> None:
+
+        super().__init__()
+
+        self._model_dir = model_dir
+        os.makedirs(model_dir, exist_ok = True)
+
+    def get_store(self, user_id: int) -> ModelStore:
+        """
+        Returns the store of a user's fitted models
+        """
+        return ModelStore(root = f"{self._model_dir}/{user_id}")
+
+    def get_model_count(self,
+                        session: Session,
+                        user_id: Optional[int]) -> int:
+
+        return (session
+                .query(Model)
+                .filter(Model.user_id == user_id if user_id else true())
+                .count())
+
+    def get_models(self,
+                   session: Session,
+                   user_id: int) -> list[ModelDTO]:
+
+        """
+        Returns all of user's fitted models (latest first)
+        """
+
+        m = (session
+                .query(Model)
+                .filter(Model.user_id == user_id)
+                .order_by(Model.created_at.desc())
+                .all())
+
+        return [ModelDTO(key            = mi.key,
+                         name           = mi.name,
+                         step           = mi.step,
+                         classname      = mi.classname,
+                         workflow       = mi.workflow,
+                         created_at_utc = mi.created_at) for mi in m]
+
+    def sync_models(self,
+                    session: Session,
+                    user_id: int) -> int:
+
+        """
+        Creates the records of the stored models that have none yet and
+        returns their number
+        """
+
+        known = {x.key for x in (session
+                                 .query(Model.key)
+                                 .filter(Model.user_id == user_id)
+                                 .all())}
+
+        added = 0
+        for info in self.get_store(user_id).get_infos():
+            if "key" not in info or info["key"] in known:
+                continue
+
+            try:
+                created_at = datetime.fromisoformat(info["created_at"])
+            except (KeyError, TypeError, ValueError):
+                created_at = datetime.now(timezone.utc)
+
+            session.add(Model(user_id    = user_id,
+                              key        = str(info["key"]),
+                              name       = str(info.get("name", "")),
+                              step       = str(info.get("step", "")),
+                              classname  = str(info.get("classname", "")),
+                              workflow   = str(info.get("workflow", "")),
+                              created_at = created_at))
+
+            known.add(info["key"])
+            added += 1
+
+        session.flush()
+
+        return added
@@ -15,7 +15,7 @@ from sqlalchemy.orm.session import sessionmaker, Session
 from sqlalchemy.engine import Engine
 
 from .interfaces import ApplicationService, AnalyticsService,\
-                        ExternalService 
+                        ExternalService, JobService
 
 class Runtime:
     """
@@ -33,6 +33,7 @@ class Runtime:
         application: ApplicationService
         analytics:   AnalyticsService
         external:    ExternalService
+        jobs:        JobService
 
     def __init__(self, 
                  ORM_BASE:    DeclarativeBase,
@@ -71,7 +72,8 @@ class Runtime:
     def register_services(self, 
                           application: ApplicationService,
                           analytics:   AnalyticsService,
-                          external:    ExternalService):
+                          external:    ExternalService,
+                          jobs:        JobService):
                           
         """
         Registers services at runtime. These services are then available to all 
@@ -82,14 +84,31 @@ class Runtime:
             analytics   (AnalyticsService):     pipeline service (handles analytics)
             storage     (DocumentStoreService): storage service (handles persistence)
             external    (ExternalService):      external service (handles LLMs)
+            jobs        (JobService):           job service (handles background runs)
         """
                           
         self._services = Runtime.Services(application,
                                           analytics,
-                                          external)
+                                          external,
+                                          jobs)
 
         self.log("services registered")
 
+    def shutdown(self) -> None:
+        """
+        Shuts the registered services down (jobs first, so that no new
+        runs are started meanwhile)
+        """
+
+        if self._services is None:
+            return
+
+        services = self._services
+        for service in [services.jobs, services.analytics, services.external, services.application]:
+            service.shutdown()
+
+        self.log("services stopped")
+
     def log(self, msg: str) -> None:
         """
         Centralized method for logging.
@@ -1,3 +1,4 @@
 from .application import *
 from .analytics import *
 from .external import *
+from .jobs import *
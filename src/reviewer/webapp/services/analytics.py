@@ -1,33 +1,155 @@
 __all__ = ["DefaultAnalyticsService"]
 
 
+import os
 import json
+import queue
 import logging
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from logging import Logger
-from typing import Optional, override, TypeVar
+from typing import Any, Callable, Optional, override, TypedDict, TypeVar
 
 from sqlalchemy.orm import Session 
 
 from ..dto import *
 from ..interfaces import AnalyticsService
-from ..models import WorkflowRepository, DatasetRepository, AnalysisRepository, ResultRepository
+from ..models import WorkflowRepository, DatasetRepository, AnalysisRepository, ResultRepository, ModelRepository
 
-from reviewer.framework.interface import IConfig
+from reviewer.framework.interface import IConfig, ILogger, IModelStore
 from reviewer.framework.workflow  import Workflow
 from reviewer.framework.analysis  import Analysis
 from reviewer.framework.dataset   import Dataset
 from reviewer.framework.figure    import Figure
 from reviewer.framework.runtime   import Runtime as AnalysisRuntime
+from reviewer.framework.cache     import StepCache
+from reviewer.framework.step.preprocessor import WordCache
 from reviewer.framework.aliases   import AnalysisTracker, WorkflowSchema, AnalysisSchema
 
 
 T = TypeVar("T", bound=IConfig)
 
 
+class _RunLogger(ILogger):
+    """
+    Forwards the run log of an analysis to a callback
+    """
+
+    def __init__(self, write: Callable[[str], None]) -> None:
+        self._write = write
+
+    @override
+    def log(self, msg: str) -> None:
+        self._write(msg)
+
+
+class _AnalysisRun(TypedDict):
+    """
+    Arguments of an analysis run (see `_execute_analysis`)
+    """
+
+    analysis:       AnalysisSchema
+    path:           str
+    columns:        list[str]
+    max_rows:       int | None
+    mapping:        dict[str, str]
+    train_part:     float
+    seed:           int | None
+    stratify_field: str | None
+    chunk_size:     int | None
+    step_cache:     StepCache | None
+    model_store:    IModelStore | None
+    predict_only:   bool
+
+
+def _execute_analysis(analysis:       AnalysisSchema,
+                      path:           str,
+                      columns:        list[str],
+                      max_rows:       int | None,
+                      mapping:        dict[str, str],
+                      tracker:        AnalysisTracker,
+                      train_part:     float,
+                      seed:           int | None,
+                      stratify_field: str | None,
+                      chunk_size:     int | None,
+                      step_cache:     StepCache | None,
+                      model_store:    IModelStore | None = None,
+                      predict_only:   bool = False,
+                      logger:         ILogger | None = None) -> Optional[tuple[AnalysisSchema, RawResultsDTO]]:
+    """
+    Loads the dataset and runs the analysis. Returns the schema of the 
+    analysis that was run and its results, or None if the dataset could
+    not be loaded.
+
+    With a chunk size, the dataset is streamed in chunks, and the steps 
+    are trained on a random sample of max_rows rows (chunk_size rows by
+    default).
+
+    Fitted embedders and predictors are saved to the model store (if any)
+    and reused by later runs on the same data. Predict-only runs train
+    nothing, they use the latest stored model of each step.
+    """
+
+    try:
+        if chunk_size:
+            dataset = Dataset.sample_path(path, n_rows = max_rows or chunk_size, columns = columns, seed = seed)
+        else:
+            dataset = Dataset.from_path(path, columns = columns, max_rows = max_rows)
+
+        dataset.partition_train_data(train_part     = train_part,
+                                     seed           = seed,
+                                     stratify_field = stratify_field)
+    except:
+        return None
+
+    analyzer = Analysis.from_schema(analysis)
+
+    analysis_runtime = AnalysisRuntime(dataset_constructor = Dataset.new,
+                                       figure_constructor  = Figure.new,
+                                       step_cache          = step_cache,
+                                       prune_fields        = True,
+                                       model_store         = model_store,
+                                       predict_only        = predict_only)
+
+    if chunk_size:
+        results = analyzer.run_stream(runtime = analysis_runtime,
+                                      sample  = dataset,
+                                      chunks  = Dataset.iter_path(path, chunk_size = chunk_size, columns = columns),
+                                      mapping = mapping,
+                                      tracker = tracker,
+                                      logger  = logger)
+    else:
+        _, results = analyzer.run(runtime = analysis_runtime, 
+                                  data    = dataset, 
+                                  mapping = mapping,
+                                  tracker = tracker,
+                                  logger  = logger)
+
+    return analyzer.to_schema(), results
+
+def _execute_analysis_in_process(events: Any, run: _AnalysisRun) -> Optional[tuple[AnalysisSchema, RawResultsDTO]]:
+    """
+    Runs an analysis in a worker process. Tracker events and the run log
+    are sent back through the (managed) events queue.
+    """
+
+    def tracker(wid: int, sid: int, name: str) -> None:
+        events.put(("step", wid, sid, name))
+
+    return _execute_analysis(tracker = tracker, 
+                             logger  = _RunLogger(lambda msg: events.put(("log", msg))),
+                             **run)
+
+
 class DefaultAnalyticsService(AnalyticsService):
     def __init__(self, 
                  work_dir:        str,
                  method_registry: str,
+                 executor:        str = "thread",
+                 max_processes:   int | None = None,
+                 cache_size:      int = 1024,
                  logger: Logger | None = None) -> None:
 
         if logger:
@@ -39,11 +161,87 @@ class DefaultAnalyticsService(AnalyticsService):
         self._a_repo = AnalysisRepository(analysis_dir = f"{work_dir}/analysis")
         self._d_repo = DatasetRepository(data_dir      = f"{work_dir}/datasets")
         self._r_repo = ResultRepository(result_dir     = f"{work_dir}/results")
+        self._m_repo = ModelRepository(model_dir       = f"{work_dir}/models")
+
+        # Step outputs are cached across runs (cache_size in MB, 0 disables the cache)
+        self._step_cache = StepCache(root      = f"{work_dir}/cache", 
+                                     max_bytes = cache_size * 2**20) if cache_size > 0 else None
+
+        # Stems / lemmas of the preprocessors are memoised across runs as well
+        if cache_size > 0:
+            WordCache.configure(directory = f"{work_dir}/cache/words")
 
         self._methods = {}
         self._register_methods(method_registry)
 
-        self._logger.info("AnalyticsService ready")
+        # Executor of analysis runs ("thread": calling thread, "process": process pool)
+        if executor not in ["thread", "process"]:
+            raise Exception(f"Unknown executor '{executor}'")
+
+        self._executor      = executor
+        self._max_processes = max_processes or os.cpu_count()
+        self._pool          = None
+        self._manager       = None
+        self._pool_lock     = threading.Lock()
+
+        self._logger.info(f"AnalyticsService ready (executor: '{executor}')")
+
+    def _get_pool(self) -> tuple[ProcessPoolExecutor, Any]:
+        # Job threads may ask for the pool concurrently (only one is created)
+        with self._pool_lock:
+            if self._pool is None:
+                # Worker processes are spawned, as forking a multi-threaded server is unsafe
+                context = multiprocessing.get_context("spawn")
+
+                self._manager = context.Manager()
+                self._pool    = ProcessPoolExecutor(max_workers = self._max_processes, 
+                                                    mp_context  = context,
+                                                    initializer = WordCache.configure,
+                                                    initargs    = WordCache.get_config())
+
+            return self._pool, self._manager
+
+    @override
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            pool, manager = self._pool, self._manager
+            self._pool, self._manager = None, None
+
+        # Queued runs are cancelled, running ones are finished first
+        if pool is not None:
+            pool.shutdown(wait = True, cancel_futures = True)
+
+        if manager is not None:
+            manager.shutdown()
+
+        self._logger.info("AnalyticsService stopped")
+
+    def _execute_in_process(self, 
+                            tracker: AnalysisTracker, 
+                            logger:  ILogger,
+                            run:     _AnalysisRun) -> Optional[tuple[AnalysisSchema, RawResultsDTO]]:
+        pool, manager = self._get_pool()
+
+        events = manager.Queue()
+        future = pool.submit(_execute_analysis_in_process, events, run)
+
+        def forward(event: tuple[Any, ...]) -> None:
+            if event[0] == "log":
+                logger.log(event[1])
+            else:
+                tracker(*event[1:])
+
+        # Forward tracker events and the run log until the run is finished
+        while not future.done():
+            try:
+                forward(events.get(timeout = 0.1))
+            except queue.Empty:
+                pass
+
+        while not events.empty():
+            forward(events.get_nowait())
+
+        return future.result()
 
     def _register_methods(self, method_registry) -> None:
         with open(method_registry, "r") as f:
@@ -164,13 +362,15 @@ class DefaultAnalyticsService(AnalyticsService):
                             user: UserDTO, 
                             dataset_name: str,
                             with_data: bool = True,
-                            max_rows: int | None = None) -> Optional[DatasetDTO]:
+                            max_rows: int | None = None,
+                            columns: list[str] | None = None) -> Optional[DatasetDTO]:
 
         return self._d_repo.get_dataset_by_name(t, 
                                                 user.user_id, 
                                                 dataset_name, 
                                                 with_data = with_data,
-                                                max_rows  = max_rows)
+                                                max_rows  = max_rows,
+                                                columns   = columns)
 
     @override
     def register_dataset(self,                               
@@ -185,7 +385,7 @@ class DefaultAnalyticsService(AnalyticsService):
            raise Exception("Invalid dataset name")
 
         # Store in repo
-        d_exists = self.get_dataset_by_name(t, user, dataset.name) is not None
+        d_exists = self.get_dataset_by_name(t, user, dataset.name, with_data = False) is not None
 
         if d_exists:
             if not overwrite:
@@ -202,13 +402,36 @@ class DefaultAnalyticsService(AnalyticsService):
                            name: str) -> None:
 
         # Find dataset
-        d = self.get_dataset_by_name(t, user, name)
+        d = self.get_dataset_by_name(t, user, name, with_data = False)
         if not d:
             raise Exception("Dataset not found")
 
         # Delete dataset
         self._d_repo.delete_dataset(t, user.user_id, name)
 
+    def _get_used_columns(self,
+                          columns:  list[str],
+                          mapping:  dict[str, str],
+                          analyzer: Analysis,
+                          schema:   AnalysisSchema,
+                          extra:    list[str]) -> list[str]:
+        """
+        Returns the dataset columns an analysis run may read: the mapped
+        columns (including the columns of mapped prefix fields), the
+        columns referenced by the workflows' sql filters and extra ones.
+        """
+
+        required = analyzer.get_fields().required
+        prefixes = [v for k, v in mapping.items() if k in required and required[k].prefix]
+        filters  = [f for w in schema.workflows if (f := w.config.get("sql_filter"))]
+        used     = set(mapping.values()) | set(extra)
+
+        def is_filtered(column: str) -> bool:
+            pattern = rf"(?<![\w`]){re.escape(column)}(?![\w`])|`{re.escape(column)}`"
+            return any([re.search(pattern, f) for f in filters])
+
+        return [c for c in columns if c in used or any([c.startswith(x) for x in prefixes]) or is_filtered(c)]
+
     # Analysis
     def _validate_analysis_dto(self, analysis: AnalysisDTO) -> Analysis:
         try:
@@ -294,28 +517,20 @@ class DefaultAnalyticsService(AnalyticsService):
 
     @override
     def run_analysis(self, 
-                     t:             Session,
-                     user:          UserDTO,
-                     analysis_name: str,
-                     dataset_name:  str,
-                     max_rows:      int | None,
-                     mapping:       dict[str, str],
-                     analysis:      AnalysisDTO,
-                     tracker:       AnalysisTracker) -> Optional[RawResultsDTO]:
+                     t:              Session,
+                     user:           UserDTO,
+                     analysis_name:  str,
+                     dataset_name:   str,
+                     max_rows:       int | None,
+                     mapping:        dict[str, str],
+                     analysis:       AnalysisDTO,
+                     tracker:        AnalysisTracker,
+                     train_part:     float      = 0.8,
+                     seed:           int | None = None,
+                     stratify_field: str | None = None,
+                     chunk_size:     int | None = None,
+                     predict_only:   bool       = False) -> Optional[RawResultsDTO]:
                      
-        # Get data
-        data = self.get_dataset_by_name(t, user, dataset_name)
-        if data is None or data.data is None:
-            return None
-
-        try:
-            dataset = Dataset.new(data.data)
-            if max_rows:
-                dataset = dataset.head(max_rows)
-            dataset.partition_train_data(train_part = 0.8)
-        except:
-            return None
-
         # Prepare schema
         analysis_schema    = AnalysisSchema.from_dict(analysis.to_dict())
         analysis_schema.id = None
@@ -327,24 +542,71 @@ class DefaultAnalyticsService(AnalyticsService):
         # Prepare analyzer
         analyzer = Analysis.from_schema(analysis_schema)
 
-        analysis_runtime = AnalysisRuntime(dataset_constructor = Dataset.new,
-                                           figure_constructor  = Figure.new)
+        # Get data (only the used columns)
+        header = self.get_dataset_by_name(t, user, dataset_name, with_data = False)
+        if header is None:
+            return None
+
+        columns = self._get_used_columns(header.columns, 
+                                         mapping  = mapping, 
+                                         analyzer = analyzer,
+                                         schema   = analysis_schema,
+                                         extra    = [stratify_field] if stratify_field else [])
+
+        path = self._d_repo.get_dataset_path(t, user.user_id, dataset_name)
+        if path is None:
+            return None
 
         # Run analysis
-        _, results = analyzer.run(runtime = analysis_runtime, 
-                                  data    = dataset, 
-                                  mapping = mapping,
-                                  tracker = tracker)
+        run = _AnalysisRun(analysis       = analysis_schema,
+                           path           = path,
+                           columns        = columns,
+                           max_rows       = max_rows,
+                           mapping        = mapping,
+                           train_part     = train_part,
+                           seed           = seed,
+                           stratify_field = stratify_field,
+                           chunk_size     = chunk_size,
+                           step_cache     = self._step_cache,
+                           model_store    = self._m_repo.get_store(user.user_id),
+                           predict_only   = predict_only)
+
+        logger = _RunLogger(self._logger.getChild("run").info)
+
+        if self._executor == "process":
+            executed = self._execute_in_process(tracker = tracker, logger = logger, run = run)
+        else:
+            executed = _execute_analysis(tracker = tracker, logger = logger, **run)
+
+            for name, stats in WordCache.get_stats().items():
+                self._logger.info(f"Word cache '{name}': {stats['size']} words ({stats['hit_rate']:.1%} hits)")
+
+        # Register the models fitted by the run
+        self._m_repo.sync_models(t, user.user_id)
+
+        if executed is None:
+            return None
+
+        schema, results = executed
 
         # Save results
         self.register_results(t, 
                               user, 
                               name     = analysis_name,
-                              analysis = analyzer.to_schema(), 
+                              analysis = schema, 
                               results  = results)
 
         return results
 
+    # Model
+    @override
+    def get_models(self,
+                   t:    Session,
+                   user: UserDTO) -> list[ModelDTO]:
+
+        return self._m_repo.get_models(t, 
+                                       user_id = user.user_id)
+
     # Result 
     @override
     def get_runs(self,
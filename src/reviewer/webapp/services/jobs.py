@@ -0,0 +1,116 @@
+__all__ = ["DefaultJobService"]
+
+
+import uuid
+import logging
+import threading
+from logging import Logger
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Any, Optional, override
+
+from ..dto import *
+from ..interfaces import JobService
+
+
+class DefaultJobService(JobService):
+
+    def __init__(self,
+                 max_workers: int = 2,
+                 max_jobs:    int = 1000,
+                 logger:      Logger | None = None) -> None:
+
+        if logger:
+            self._logger = logger.getChild("jobs")
+        else:
+            self._logger = logging.getLogger("jobs")
+
+        self._executor = ThreadPoolExecutor(max_workers        = max_workers,
+                                            thread_name_prefix = "job")
+        self._max_jobs = max_jobs
+
+        # Job registry (job_id -> (user_id, job))
+        self._jobs: dict[str, tuple[int, JobDTO]] = {}
+        self._lock = threading.Lock()
+
+        self._logger.info(f"JobService ready ({max_workers} workers)")
+
+    def _update(self, job_id: str, **changes: Any) -> JobDTO:
+        with self._lock:
+            user_id, job = self._jobs[job_id]
+            job = replace(job, **changes)
+            self._jobs[job_id] = (user_id, job)
+
+        return job
+
+    def _evict(self) -> None:
+        """
+        Forgets the oldest finished jobs, if the registry is full
+        """
+
+        finished = [k for k, (_, job) in self._jobs.items()
+                        if job.status in (JobStatus.DONE, JobStatus.FAILED)]
+
+        for job_id in finished[:max(len(self._jobs) - self._max_jobs, 0)]:
+            del self._jobs[job_id]
+
+    @override
+    def submit(self,
+               user:    UserDTO,
+               name:    str,
+               task:    Callable[[], Any],
+               on_done: Callable[[JobDTO], None] | None = None) -> JobDTO:
+
+        job = JobDTO(job_id         = uuid.uuid4().hex,
+                     name           = name,
+                     status         = JobStatus.QUEUED,
+                     error          = None,
+                     created_at_utc = datetime.now(timezone.utc))
+
+        with self._lock:
+            self._jobs[job.job_id] = (user.user_id, job)
+            self._evict()
+
+        def run() -> None:
+            self._update(job.job_id, status = JobStatus.RUNNING)
+
+            try:
+                task()
+                finished = self._update(job.job_id,
+                                        status          = JobStatus.DONE,
+                                        finished_at_utc = datetime.now(timezone.utc))
+            except Exception as e:
+                self._logger.exception(f"Job '{name}' ({job.job_id}) failed")
+                finished = self._update(job.job_id,
+                                        status          = JobStatus.FAILED,
+                                        error           = str(e) or "Job failed",
+                                        finished_at_utc = datetime.now(timezone.utc))
+
+            if on_done:
+                on_done(finished)
+
+        self._executor.submit(run)
+
+        return job
+
+    @override
+    def get_job(self,
+                user:   UserDTO,
+                job_id: str) -> Optional[JobDTO]:
+
+        with self._lock:
+            user_id, job = self._jobs.get(job_id, (None, None))
+
+        if job is None or user_id != user.user_id:
+            return None
+
+        return job
+
+    @override
+    def shutdown(self) -> None:
+        # Queued jobs are cancelled, running ones are not waited for
+        self._executor.shutdown(wait = False, cancel_futures = True)
+
+        self._logger.info("JobService stopped")
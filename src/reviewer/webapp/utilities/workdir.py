@@ -6,6 +6,6 @@ import os
 def prepare_workdir(root: str) -> None:
     os.makedirs(root, exist_ok = True)
 
-    for folder in ["workflows", "analysis", "results", "datasets"]:
+    for folder in ["workflows", "analysis", "results", "datasets", "cache", "models"]:
         os.makedirs(f"{root}/{folder}", exist_ok = True)
 
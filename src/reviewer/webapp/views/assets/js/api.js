@@ -309,6 +309,21 @@ const api_analyze = async function(analysis_name, analysis_schema) {
   return result;
 };
 
+const api_job = async function(job_id) {
+
+  var result = fetch("/api/jobs/" + job_id, {
+    method: "GET",
+    headers: get_auth_headers()
+  })
+    .then(response => response.json())
+    .catch(error => {
+      console.error(error);
+      return {};
+    })
+
+  return result;
+};
+
 const api_runs = async function() {
 
   var result = fetch("/api/results", {
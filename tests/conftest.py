@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The package is imported from the source tree
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
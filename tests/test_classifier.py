@@ -0,0 +1,23 @@
+from sklearn.naive_bayes import MultinomialNB
+
+from reviewer.framework import Runtime, Workflow, Analysis, Dataset, Figure
+from reviewer.framework.step import TfIdfEmbedder, TfIdfEmbedderConfig, NaiveBayes, NaiveBayesConfig
+
+
+def test_naive_bayes_variant_survives_schema_round_trip():
+    data = Dataset.new({"text": ["loved it", "broke after a day", "would buy again", "not great"] * 3,
+                        "y":    [1, 0, 1, 0] * 3})
+
+    workflow = (Workflow()
+                .add(TfIdfEmbedder(TfIdfEmbedderConfig(use_svd = False)))
+                .add(NaiveBayes(NaiveBayesConfig(variant = "multinomial"))))
+
+    workflow = Workflow.from_schema(workflow.to_schema())
+    runtime  = Runtime(dataset_constructor = Dataset.new, figure_constructor = Figure.new)
+
+    # The sparse TF-IDF features are accepted by the configured variant only
+    post, _ = Analysis().add(workflow).run(runtime, data, mapping = {"text": "text", "y": "y"})
+
+    step = workflow._steps[1]
+    assert isinstance(step, NaiveBayes) and isinstance(step._model, MultinomialNB)
+    assert post.get_field_values("y_pred") == [1, 0, 1, 0] * 3
@@ -0,0 +1,27 @@
+import numpy as np
+
+from reviewer.framework import Dataset
+from reviewer.framework.step import CollaborativeFiltering, CollaborativeFilteringConfig
+
+
+def test_recommendations_follow_svd_predict_on_a_scale_below_one():
+    rng  = np.random.default_rng(0)
+    data = Dataset.new({"user_id":    rng.integers(0, 30, 400).tolist(),
+                        "product_id": rng.integers(100, 140, 400).tolist(),
+                        "rating":     rng.integers(-2, 3, 400).tolist()})
+
+    step = CollaborativeFiltering(CollaborativeFilteringConfig(min_rating = -2, max_rating = 2, max_recommendations = 3))
+    step.train(data)
+
+    post = step.predict(data)
+
+    users    = data.get_field_values("user_id")
+    products = sorted(set(data.get_field_values("product_id")))
+    rated    = set(zip(users, data.get_field_values("product_id")))
+
+    for row, user in enumerate(users):
+        # Unrated products by descending estimate (ties: lowest product id first)
+        scores   = [(-step._model.predict(user, x).est, x) for x in products if (user, x) not in rated]
+        expected = [x for _, x in sorted(scores)[:3]]
+
+        assert [post.get_field_values(f"recommendation{i + 1}")[row] for i in range(3)] == expected
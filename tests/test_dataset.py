@@ -0,0 +1,15 @@
+from reviewer.framework import Dataset
+
+
+def test_fingerprint_of_token_lists():
+    data = Dataset.new({"tok": [["a", "b"], ["c"]], "text": ["a b", "c"]})
+
+    assert data.fingerprint("tok") == Dataset.new({"tok": [["a", "b"], ["c"]]}).fingerprint("tok")
+
+    # Lists differing by their tokens or by the split of the tokens
+    assert data.fingerprint("tok") != Dataset.new({"tok": [["a", "b"], ["d"]]}).fingerprint("tok")
+    assert data.fingerprint("tok") != Dataset.new({"tok": [["a"], ["b", "c"]]}).fingerprint("tok")
+    assert data.fingerprint("tok") != Dataset.new({"tok": [["a b"], ["c"]]}).fingerprint("tok")
+
+    # Token lists and strings
+    assert data.fingerprint("tok") != data.fingerprint("text")
@@ -0,0 +1,11 @@
+from reviewer.framework import Dataset
+from reviewer.framework.step import HashingEmbedder, HashingEmbedderConfig
+
+
+def test_hashing_embedder_on_fewer_texts_than_components():
+    data = Dataset.new({"text": ["good value", "broke after a day", "would buy again"]})
+    step = HashingEmbedder(HashingEmbedderConfig(max_svd_components = 128))
+
+    step.train(data)
+
+    assert step.embed(data).get_matrix_field("emb_").shape == (3, 3)
@@ -0,0 +1,15 @@
+import pytest
+
+from reviewer.framework import Workflow
+from reviewer.framework.step import Preprocessor, PreprocessorConfig
+
+
+def test_tokens_require_a_new_output_field():
+    step = Preprocessor(PreprocessorConfig(input_field = "text", output_field = "text", output_tokens = True))
+
+    with pytest.raises(Exception, match = "Cannot write tokens"):
+        Workflow().add(step)
+
+    step = Preprocessor(PreprocessorConfig(input_field = "text", output_field = "tokens", output_tokens = True))
+
+    assert "tokens" in Workflow().add(step).get_fields().created
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from reviewer.framework import Dataset
+from reviewer.framework.buckets import bucket_dates
+from reviewer.framework.step import TemporalRatingAnalyser, TemporalRatingAnalyserConfig
+
+
+def test_rating_quantiles_per_date():
+    dates   = ["2021-01-01", "2021-01-02", "2021-01-01", "2021-01-02", "2021-01-01"]
+    ratings = [1, 5, 2, 4, 3]
+
+    step    = TemporalRatingAnalyser(TemporalRatingAnalyserConfig(quantiles = [0.25, 0.5]))
+    results = step.analyse(Dataset.new({"rating": ratings, "date": dates}), {}, Dataset.new)
+    values  = {r.result_name: r.value.to_dict() for r in results}["rating_quantiles"]
+
+    for date in set(dates):
+        expected = np.quantile([r for r, d in zip(ratings, dates) if d == date], [0.25, 0.5])
+        actual   = [v for d, v in zip(values["date"], values["value"]) if d == date]
+
+        assert actual == [float(x) for x in expected]
+
+
+def test_numeric_dates():
+    # Unix timestamps (in seconds) by default
+    assert bucket_dates([1706659200, None], "month") == ["2024-01", None]
+
+    # YYYYMMDD numbers are rejected, unless their format is given
+    with pytest.raises(Exception, match = "YYYYMMDD"):
+        bucket_dates([20240131, 20240201], "month")
+
+    assert bucket_dates([20240131, 20240201, None], "month", date_format = "%Y%m%d") == ["2024-01", "2024-02", None]
@@ -0,0 +1,119 @@
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from reviewer.framework import Runtime, Workflow, Analysis, Dataset, Figure, StepCache, ModelStore
+from reviewer.framework.aliases import FieldSchema
+from reviewer.framework.interface import IConfig, IDataset, ILogger, IPreprocessor
+from reviewer.framework.step import RatingAnalyser, TfIdfEmbedder, TfIdfEmbedderConfig
+
+
+@dataclass
+class UpperConfig(IConfig):
+
+    field: str = "text"
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class Upper(IPreprocessor[UpperConfig]):
+    """
+    Preprocessor rewriting its field in place
+    """
+
+    def __init__(self, config: UpperConfig | None = None) -> None:
+        super().__init__(config)
+
+        self._config = config or self.get_default_config()
+
+    @property
+    def name(self) -> str:
+        return "Upper"
+
+    def get_default_config(self) -> UpperConfig:
+        return UpperConfig()
+
+    def get_required_fields(self) -> dict[str, FieldSchema]:
+        return {self._config.field: FieldSchema(dtype = str)}
+
+    def get_created_fields(self) -> dict[str, FieldSchema]:
+        return {}
+
+    def preprocess(self, data: IDataset) -> IDataset:
+        data = data.copy()
+        data.set_field_values(self._config.field, [x.upper() for x in data.get_field_values(self._config.field)])
+
+        return data
+
+
+def test_cached_in_place_preprocessing(tmp_path):
+    data     = Dataset.new({"text": ["loved it", "broke after a day"]})
+    workflow = Workflow().add(Upper())
+
+    outputs = []
+    for _ in range(2):
+        runtime = Runtime(dataset_constructor = Dataset.new,
+                          figure_constructor  = Figure.new,
+                          step_cache          = StepCache(str(tmp_path)))
+
+        post, _ = Analysis().add(workflow).run(runtime, data, mapping = {"text": "text"})
+        outputs.append(post.get_field_values("text"))
+
+    assert outputs[0] == outputs[1] == ["LOVED IT", "BROKE AFTER A DAY"]
+
+
+def test_stream_runs_only_the_steps_partial_analysers_need():
+    calls = []
+
+    class CountingUpper(Upper):
+        def preprocess(self, data: IDataset) -> IDataset:
+            calls.append(len(data.get_field_values(self._config.field)))
+            return super().preprocess(data)
+
+    fields  = {"text": ["a", "b", "c", "d"], "rating": [1, 2, 5, 5]}
+    runtime = Runtime(dataset_constructor = Dataset.new, figure_constructor = Figure.new)
+    chunks  = [Dataset.new({k: v[:2] for k, v in fields.items()}), Dataset.new({k: v[2:] for k, v in fields.items()})]
+
+    analysis = Analysis().add(Workflow().add(CountingUpper()).add(RatingAnalyser()))
+    results  = analysis.run_stream(runtime, Dataset.new(fields), chunks, mapping = {"text": "text", "rating": "rating"})
+
+    # The sample is preprocessed once, the chunks are not (the analyser does not need the text)
+    assert calls == [4]
+
+    _, expected = Analysis().add(Workflow().add(Upper()).add(RatingAnalyser())).run(runtime, Dataset.new(fields), mapping = {"text": "text", "rating": "rating"})
+
+    flat = lambda r: {x.result_name: x.value.to_dict() for m in r.values() for rs in m.values() for x in rs}
+    assert flat(results) == flat(expected)
+
+
+def test_fitted_models_are_stored_and_reused(tmp_path):
+    class Log(ILogger):
+        def __init__(self) -> None:
+            self.messages: list[str] = []
+
+        def log(self, msg: str) -> None:
+            self.messages.append(msg)
+
+    class FailingStore(ModelStore):
+        def save(self, key: str, name: str, state: Any, info: dict[str, Any]) -> None:
+            raise OSError("disk full")
+
+    data = Dataset.new({"text": ["good value", "broke after a day", "would buy again", "not great"]})
+
+    def run(store: ModelStore) -> tuple[Any, list[str]]:
+        runtime  = Runtime(dataset_constructor = Dataset.new, figure_constructor = Figure.new, model_store = store)
+        workflow = Workflow().add(TfIdfEmbedder(TfIdfEmbedderConfig(max_svd_components = 2, svd_random_state = 0)))
+        logger   = Log()
+
+        post, _ = Analysis().add(workflow).run(runtime, data, mapping = {"text": "text"}, logger = logger)
+        return post.get_matrix_field("emb_"), logger.messages
+
+    first, _         = run(ModelStore(str(tmp_path)))
+    second, messages = run(ModelStore(str(tmp_path)))
+
+    assert "Using stored model of step 'TF-IDF-Embedder'" in messages
+    assert (first == second).all()
+
+    # Failing to store a model does not fail the run
+    _, messages = run(FailingStore(str(tmp_path / "failing")))
+    assert any([x.startswith("Cannot store model of step 'TF-IDF-Embedder'") for x in messages])